@@ -12,6 +12,7 @@ CREATE TABLE IF NOT EXISTS content (
     quiz_data TEXT,
     source_name TEXT,
     license_info TEXT,
+    content_hash TEXT,
     scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -97,7 +97,11 @@ const ModuleView = ({ moduleId, content, progress }) => {
                 title={lesson.title}
                 description={
                   <Space direction="vertical">
-                    <span>{lesson.description?.slice(0, 100)}...</span>
+                    <span>
+                      {lesson.description
+                        ? `${lesson.description.slice(0, 100)}...`
+                        : `Ressource ${lesson.source_name || 'externe'}`}
+                    </span>
                     <span>
                       <Tag color={prog.completed ? 'green' : 'orange'}>
                         {prog.completed ? '✅ Terminé' : '⏳ Non commencé'}
@@ -0,0 +1,2922 @@
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qsl, urlencode, unquote
+import hashlib
+import heapq
+import io
+import itertools
+import argparse
+import codecs
+import json
+import math
+import os
+import queue
+import re
+import signal
+import socketserver
+import sys
+import time
+import threading
+import unicodedata
+import zlib
+import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from collections import Counter, deque, namedtuple
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache, partial, wraps
+import logging
+
+from topic_config import TOPIC_CONFIGURATIONS, TOPIC_SPECIFIC_SOURCES
+
+# requests, bs4, backoff, chardet, sqlite3 and robotparser are imported where they are first
+# needed, so DB-only and stats commands never load the network stack.
+
+logger = logging.getLogger(__name__)
+
+def configure_logging(log_file='scraper.log'):
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
+
+# Legitimate open educational resources
+LEGITIMATE_SOURCES = {
+    "fun_mooc": {
+        "base_url": "https://www.fun-mooc.fr",
+        "name": "FUN-MOOC (France Université Numérique)",
+        "allowed": True,
+        "license": "Varies, generally open for educational use",
+        "rate_limit": {"calls": 5, "period": 60, "delay": 4},
+        "cache_ttl": 3600,
+        "parser": "lxml",
+        "parse_only": ".course-glimpse, .course-card, .course-item",
+        "discovery": "sitemap",
+        "sitemaps": ["/sitemap.xml"],
+        "sitemap_pattern": r"/(fr|en)/cours/[^/]+/?$",
+        "max_sitemap_pages_per_run": 10,
+        "page_parser": "parse_fun_mooc_course_page",
+        "search_endpoints": []
+    },
+    "wikiversity_fr": {
+        "base_url": "https://fr.wikiversity.org",
+        "name": "Wikiversity French",
+        "allowed": True,
+        "license": "CC BY-SA",
+        "rate_limit": {"calls": 5, "period": 60, "delay": 3},
+        "cache_ttl": 86400,
+        "parser": "lxml",
+        "parse_only": "#mw-content-text",
+        "max_depth": 2,
+        "max_pages_per_run": 25,
+        "mode": "api",
+        "api_path": "/w/api.php",
+        "categories": []
+    },
+    "wikiversity_en": {
+        "base_url": "https://en.wikiversity.org",
+        "name": "Wikiversity English",
+        "allowed": True,
+        "license": "CC BY-SA",
+        "rate_limit": {"calls": 5, "period": 60, "delay": 3},
+        "cache_ttl": 86400,
+        "parser": "lxml",
+        "parse_only": "#mw-content-text",
+        "max_depth": 2,
+        "max_pages_per_run": 25,
+        "mode": "api",
+        "api_path": "/w/api.php",
+        "sections": []
+    },
+    "mit_ocw": {
+        "base_url": "https://ocw.mit.edu",
+        "name": "MIT OpenCourseWare",
+        "allowed": True,
+        "license": "CC BY-NC-SA",
+        "rate_limit": {"calls": 5, "period": 60, "delay": 3},
+        "cache_ttl": 604800,
+        "parser": "lxml",
+        "discovery": "sitemap",
+        "sitemaps": ["/sitemap.xml"],
+        "sitemap_pattern": r"/courses/[^/]+/?$",
+        "max_sitemap_pages_per_run": 10,
+        "page_parser": "parse_mit_course_page",
+        "course_searches": []
+    },
+    "openclassrooms": {
+        "base_url": "https://openclassrooms.com",
+        "name": "OpenClassrooms (Free Courses Only)",
+        "allowed": True,
+        "license": "CC BY-SA for open courses",
+        "rate_limit": {"calls": 5, "period": 60, "delay": 4},
+        "cache_ttl": 3600,
+        "parser": "lxml",
+        "parse_only": ".course-card, .courseCard, .search-result",
+        "page_parser": "parse_openclassrooms_page",
+        "search_terms": []
+    },
+    "france_ioi": {
+        "base_url": "http://www.france-ioi.org",
+        "name": "France IOI",
+        "allowed": True,
+        "license": "Free educational use",
+        "rate_limit": {"calls": 5, "period": 60, "delay": 3},
+        "cache_ttl": 604800,
+        "parser": "lxml",
+        "parse_only": "a",
+        "page_parser": "parse_france_ioi_page",
+        "sections": ["/algo/course.php", "/cours/coursAlgo.php"]
+    }
+}
+
+@lru_cache(maxsize=None)
+def configured_sources():
+    # LEGITIMATE_SOURCES merged with topic-specific overrides; lists (search terms, categories) add up
+    # across topics instead of the last topic replacing the others.
+    sources = {source: dict(config) for source, config in LEGITIMATE_SOURCES.items()}
+    for topic, config in TOPIC_SPECIFIC_SOURCES.items():
+        for source, source_config in config.items():
+            if source not in sources:
+                continue
+            for key, value in source_config.items():
+                current = sources[source].get(key)
+                if isinstance(value, list) and isinstance(current, list):
+                    sources[source][key] = current + [item for item in value if item not in current]
+                else:
+                    sources[source][key] = value
+    return sources
+
+def is_transient_request_error(error):
+    import requests
+    if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+        return True
+    response = getattr(error, 'response', None)
+    return response is not None and (response.status_code == 429 or response.status_code >= 500)
+
+def retry_on_request_errors(func):
+    # backoff and requests are only imported on the first call. The wrapped function re-raises transient
+    # errors to get retried; once the tries are spent the call returns None like any other failed fetch.
+    retrying = None
+
+    def metrics_for(details):
+        return getattr(details['args'][0], 'metrics', None) if details['args'] else None
+
+    def count_retry(details):
+        metrics = metrics_for(details)
+        if metrics is not None:
+            metrics.incr('fetch_retries')
+            metrics.incr('fetch_retry_wait_seconds', details.get('wait', 0))
+
+    def count_giveup(details):
+        metrics = metrics_for(details)
+        if metrics is not None:
+            metrics.incr('fetch_giveups')
+        logger.error(f"Giving up on {details['args'][1] if len(details['args']) > 1 else func.__name__} "
+                     f"after {details['tries']} tries: {details.get('exception')}")
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal retrying
+        if retrying is None:
+            import requests
+            from backoff import on_exception, expo
+            retrying = on_exception(
+                expo, requests.RequestException, max_tries=3, giveup=lambda e: not is_transient_request_error(e),
+                on_backoff=count_retry, on_giveup=count_giveup, raise_on_giveup=False
+            )(func)
+        return retrying(*args, **kwargs)
+    return wrapper
+
+DJANGAPP_MODULE_KEYWORDS = {
+    "bureautique": ["word", "excel", "powerpoint", "office", "bureautique", "traitement texte", "tableur"],
+    "informatique": ["ordinateur", "windows", "système", "fichiers", "internet", "email", "sécurité"],
+    "programmation": ["programmation", "scratch", "python", "html", "css", "code", "algorithme"]
+}
+
+# @@field@@ marks the per-course values; everything else is serialized once when the engine is built.
+QUIZ_TEMPLATES = {
+    "bureautique": {
+        "title": "Quiz - @@title@@",
+        "questions": [
+            {
+                "question": "Quel est l'usage principal de @@title_lower@@ ?",
+                "options": ["Bureautique", "Jeux", "Internet", "Musique"],
+                "correct": 0
+            },
+            {
+                "question": "Quelle extension est commune aux fichiers Office ?",
+                "options": [".txt", ".docx", ".jpg", ".mp3"],
+                "correct": 1
+            }
+        ]
+    },
+    "informatique": {
+        "title": "Quiz - @@title@@",
+        "questions": [
+            {
+                "question": "Dans le contexte de @@title_lower@@, quel aspect est prioritaire ?",
+                "options": ["Sécurité", "Rapidité", "Couleur", "Prix"],
+                "correct": 0
+            }
+        ]
+    },
+    "programmation": {
+        "title": "Quiz - @@title@@",
+        "questions": [
+            {
+                "question": "Qu'est-ce que la programmation ?",
+                "options": ["Écrire du code", "Jouer", "Lire", "Dormir"],
+                "correct": 0
+            }
+        ]
+    }
+}
+
+QUIZ_KEYWORD_QUESTION = {
+    "question": "Quel concept est lié à @@title@@ ?",
+    "options": ["@@keyword@@", "@@distractor_1@@", "@@distractor_2@@", "@@distractor_3@@"],
+    "correct": 0
+}
+
+QUIZ_DEFAULT_DISTRACTORS = ("Autre", "Incorrect", "Faux")
+
+# Words of four letters or more that carry no meaning about a course; IDF alone only demotes them
+# once the corpus is large.
+KEYWORD_STOPWORDS = frozenset("""
+    avec dans pour cette cela ceci sont être avoir fait faire plus moins tout tous toute toutes leur leurs
+    nous vous elles comme mais aussi ainsi entre vers chez sans très bien peut peuvent dont donc quand
+    quel quelle quels quelles votre notre était sera seront avez avons autre autres même mêmes encore
+    après avant depuis pendant selon celle celui ceux celles lors alors également chaque ensemble
+    cours leçon leçons module modules chapitre introduction découvrir apprendre apprenez permet
+    présente présenter niveau notions bases semaine semaines
+    with this that from have been will your their they them there these those what which when where
+    while about into over under more most some such than then also only other each very just using
+    used course courses learn learning lesson lessons week weeks students student able does basics
+""".split())
+
+SIMPLE_SELECTOR_PATTERNS = {
+    'name': re.compile(r'[a-zA-Z][\w-]*'),
+    'id': re.compile(r'#([\w-]+)'),
+    'class_': re.compile(r'\.([\w-]+)')
+}
+
+def resolve_parser(name):
+    from bs4.builder import builder_registry
+    for candidate in (name, 'html.parser'):
+        if candidate and builder_registry.lookup(candidate) is not None:
+            return candidate
+    return 'html.parser'
+
+def strainer_for(selector):
+    from bs4 import SoupStrainer
+    targets = {}
+    for part in selector.split(','):
+        part = part.strip()
+        for kind, pattern in SIMPLE_SELECTOR_PATTERNS.items():
+            match = pattern.fullmatch(part)
+            if match:
+                targets.setdefault(kind, []).append(match.group(match.lastindex or 0))
+                break
+        else:
+            return None
+    if len(targets) != 1:
+        return None
+    kind, values = next(iter(targets.items()))
+    if kind == 'name':
+        return SoupStrainer(values)
+    return SoupStrainer(**{kind: values})
+
+CATEGORY_NAMESPACES = ('Category', 'Catégorie')
+
+TRACKING_QUERY_PARAMS = ('utm_', 'fbclid', 'gclid')
+
+def normalize_url(url):
+    parts = urlparse(url.strip())
+    scheme = parts.scheme.lower() or 'https'
+    netloc = parts.netloc.lower()
+    if (scheme == 'http' and netloc.endswith(':80')) or (scheme == 'https' and netloc.endswith(':443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    path = parts.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    query = urlencode(sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_QUERY_PARAMS)
+    ))
+    return urlunparse((scheme, netloc, path, '', query, ''))
+
+def course_fingerprint(course):
+    if course.get('url'):
+        key = normalize_url(course['url'])
+    else:
+        key = f"{course.get('source', '')}|{fold_text(' '.join(course.get('title', '').split()))}"
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+class FoldTable(dict):
+    # str.translate table mapping each character to its NFKD form without combining marks ("é" -> "e").
+    # Entries are computed the first time a code point is seen.
+    def __missing__(self, codepoint):
+        decomposed = unicodedata.normalize('NFKD', chr(codepoint))
+        folded = ''.join(c for c in decomposed if not unicodedata.combining(c))
+        self[codepoint] = folded
+        return folded
+
+FOLD_TABLE = FoldTable()
+NON_ASCII_RUN = re.compile(r'[^\x00-\x7f]+')
+
+def fold_text(text):
+    # Only the non-ASCII runs go through the table; French text is mostly ASCII.
+    text = text.lower()
+    if text.isascii():
+        return text
+    return NON_ASCII_RUN.sub(lambda run: run.group().translate(FOLD_TABLE), text)
+
+class KeywordMatcher:
+    def __init__(self, keywords_by_label):
+        self.labels = list(keywords_by_label)
+        self.keyword_labels = {}
+        for label, keywords in keywords_by_label.items():
+            for keyword in keywords:
+                folded = ' '.join(fold_text(keyword).split())
+                if not folded:
+                    continue
+                labels = self.keyword_labels.setdefault(folded, [])
+                if label not in labels:
+                    labels.append(label)
+        # Only letters count as a word edge, so "python3" and "html5" still match; keywords that begin or end
+        # with a symbol ("c++", "c#", ".net") get no edge check on that side, where \b could never match.
+        # The leading check sits once in front of its whole group so the engine can still skip ahead on literals.
+        ordered = sorted(self.keyword_labels, key=len, reverse=True)
+        word_led = '|'.join(self._keyword_pattern(keyword) for keyword in ordered if keyword[0].isalnum())
+        symbol_led = '|'.join(self._keyword_pattern(keyword) for keyword in ordered if not keyword[0].isalnum())
+        groups = []
+        if word_led:
+            groups.append(rf"(?<![^\W\d_])({word_led})")
+        if symbol_led:
+            groups.append(f"({symbol_led})")
+        self.pattern = re.compile(f"(?:{'|'.join(groups)})s?") if groups else None
+
+    @staticmethod
+    def _keyword_pattern(keyword):
+        pattern = re.escape(keyword).replace(r'\ ', r'\s+')
+        if keyword[-1].isalnum():
+            pattern += r'(?=s?(?![^\W\d_]))'
+        return pattern
+
+    def match(self, text):
+        counts = {}
+        if self.pattern is None or not text:
+            return counts
+        for found in self.pattern.finditer(fold_text(text)):
+            keyword = ' '.join(found.group(found.lastindex).split())
+            for label in self.keyword_labels[keyword]:
+                counts[label] = counts.get(label, 0) + 1
+        return {label: counts[label] for label in self.labels if label in counts}
+
+MEDIAWIKI_EXTRACTS_LIMIT = 20
+
+FetchedDocument = namedtuple('FetchedDocument', ['body', 'encoding', 'status', 'etag'], defaults=(200, None))
+
+HEADER_CHARSET = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+META_CHARSET = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?([\w.:-]+)', re.I)
+
+class EncodingResolver:
+    def __init__(self, sniff_bytes=4096, detect_bytes=32768):
+        self.sniff_bytes = sniff_bytes
+        self.detect_bytes = detect_bytes
+        self.host_encodings = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _known(encoding):
+        if isinstance(encoding, bytes):
+            encoding = encoding.decode('ascii', errors='ignore')
+        try:
+            return codecs.lookup(encoding).name if encoding else None
+        except LookupError:
+            return None
+
+    def resolve(self, url, content_type, body):
+        match = HEADER_CHARSET.search(content_type or '')
+        encoding = self._known(match.group(1)) if match else None
+        if encoding:
+            return encoding
+        match = META_CHARSET.search(body[:self.sniff_bytes])
+        encoding = self._known(match.group(1)) if match else None
+        if encoding:
+            return encoding
+        netloc = urlparse(url).netloc
+        with self.lock:
+            encoding = self.host_encodings.get(netloc)
+        if encoding:
+            return encoding
+        prefix = body[:self.detect_bytes]
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            from requests.compat import chardet
+            encoding = self._known(chardet.detect(prefix).get('encoding')) or 'utf-8'
+        with self.lock:
+            self.host_encodings[netloc] = encoding
+        logger.info(f"Detected {encoding} encoding for {netloc}")
+        return encoding
+
+class TokenBucket:
+    def __init__(self, calls, period, burst=None):
+        self.rate = calls / period
+        self.capacity = burst or calls
+        self.tokens = float(self.capacity)
+        self.min_interval = 0.0
+        self.updated = time.monotonic()
+        self.last_request = None
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+            if self.last_request is not None:
+                wait = max(wait, self.last_request + self.min_interval - now)
+            if wait <= 0:
+                self.tokens -= 1
+                self.last_request = now
+            return wait
+
+class HostRateLimiter:
+    def __init__(self, default_calls=5, default_period=60):
+        self.default_calls = default_calls
+        self.default_period = default_period
+        self.buckets = {}
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    def _bucket(self, netloc):
+        with self.lock:
+            bucket = self.buckets.get(netloc)
+            if bucket is None:
+                bucket = TokenBucket(self.default_calls, self.default_period)
+                self.buckets[netloc] = bucket
+                self.stats[netloc] = {'requests': 0, 'waits': 0, 'wait_seconds': 0.0, 'max_wait': 0.0, 'queued': 0}
+            return bucket
+
+    def configure(self, netloc, calls=None, period=None, burst=None, delay=None):
+        bucket = self._bucket(netloc)
+        with bucket.lock:
+            bucket.rate = (calls or self.default_calls) / (period or self.default_period)
+            bucket.capacity = burst or calls or self.default_calls
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+            if delay:
+                bucket.min_interval = max(bucket.min_interval, float(delay))
+
+    def set_crawl_delay(self, netloc, delay):
+        bucket = self._bucket(netloc)
+        with bucket.lock:
+            bucket.min_interval = max(bucket.min_interval, float(delay))
+
+    def acquire(self, url, deadline=None):
+        # Returns the seconds waited for a slot. When the next slot only frees up after deadline (a
+        # time.monotonic() value), sleeps until the deadline at most and returns None instead.
+        netloc = urlparse(url).netloc
+        bucket = self._bucket(netloc)
+        stats = self.stats[netloc]
+        waited = 0.0
+        wait = bucket.reserve()
+        if wait > 0:
+            with self.lock:
+                stats['queued'] += 1
+            try:
+                while wait > 0:
+                    if deadline is not None and time.monotonic() + wait > deadline:
+                        time.sleep(max(deadline - time.monotonic(), 0))
+                        return None
+                    time.sleep(wait)
+                    waited += wait
+                    wait = bucket.reserve()
+            finally:
+                with self.lock:
+                    stats['queued'] -= 1
+        with self.lock:
+            stats['requests'] += 1
+            if waited:
+                stats['waits'] += 1
+                stats['wait_seconds'] += waited
+                stats['max_wait'] = max(stats['max_wait'], waited)
+        return waited
+
+    def get_stats(self):
+        with self.lock:
+            return {
+                netloc: dict(stats, wait_seconds=round(stats['wait_seconds'], 2), max_wait=round(stats['max_wait'], 2),
+                             rate_per_minute=round(self.buckets[netloc].rate * 60, 2),
+                             crawl_delay=self.buckets[netloc].min_interval)
+                for netloc, stats in self.stats.items()
+            }
+
+class HttpCache:
+    def __init__(self, cache_dir, max_bytes=50 * 1024 * 1024):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, 'responses.db')
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        import sqlite3
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_responses_access ON responses(last_access)')
+        self.conn.commit()
+
+    def record(self, outcome):
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT body, encoding, etag, last_modified, stored_at FROM responses WHERE url = ?', (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE responses SET last_access = ? WHERE url = ?', (time.time(), url))
+            self.conn.commit()
+        return {'body': row[0], 'encoding': row[1], 'etag': row[2], 'last_modified': row[3], 'stored_at': row[4]}
+
+    def put(self, url, body, encoding=None, etag=None, last_modified=None):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, body, encoding, etag, last_modified, now, now, len(body))
+            )
+            self._evict()
+            self.conn.commit()
+
+    def touch(self, url):
+        now = time.time()
+        with self.lock:
+            self.conn.execute('UPDATE responses SET stored_at = ?, last_access = ? WHERE url = ?', (now, now, url))
+            self.conn.commit()
+
+    def _evict(self):
+        total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        expired = []
+        for url, size in self.conn.execute('SELECT url, size FROM responses ORDER BY last_access'):
+            if total <= self.max_bytes:
+                break
+            expired.append((url,))
+            total -= size
+        self.conn.executemany('DELETE FROM responses WHERE url = ?', expired)
+        logger.info(f"Evicted {len(expired)} cached responses")
+
+    def get_stats(self):
+        with self.lock:
+            entries, size = self.conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+        lookups = self.hits + self.revalidated + self.misses
+        return {
+            'entries': entries,
+            'bytes': size,
+            'hits': self.hits,
+            'revalidated': self.revalidated,
+            'misses': self.misses,
+            'hit_ratio': round((self.hits + self.revalidated) / lookups, 3) if lookups else 0.0
+        }
+
+class CrawlStateStore:
+    def __init__(self, path, max_interval=30 * 86400, history_size=50):
+        self.path = path
+        self.max_interval = max_interval
+        self.history_size = history_size
+        self.skipped = 0
+        self.unchanged = 0
+        self.changed = 0
+        self.failed = 0
+        self.lock = threading.Lock()
+        import sqlite3
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_state (
+                url TEXT PRIMARY KEY,
+                source TEXT,
+                status INTEGER,
+                etag TEXT,
+                content_hash TEXT,
+                records TEXT,
+                parser TEXT,
+                scoped INTEGER NOT NULL DEFAULT 1,
+                change_rate REAL NOT NULL DEFAULT 0,
+                first_seen REAL NOT NULL,
+                fetched_at REAL NOT NULL,
+                changed_at REAL,
+                fetch_count INTEGER NOT NULL DEFAULT 0,
+                change_count INTEGER NOT NULL DEFAULT 0,
+                next_due REAL NOT NULL
+            )
+        ''')
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(crawl_state)')}
+        for column, definition in (('parser', 'TEXT'), ('scoped', 'INTEGER NOT NULL DEFAULT 1'),
+                                   ('change_rate', 'REAL NOT NULL DEFAULT 0')):
+            if column not in columns:
+                self.conn.execute(f'ALTER TABLE crawl_state ADD COLUMN {column} {definition}')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_history (
+                url TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                content_hash TEXT NOT NULL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS crawl_discovery (
+                source TEXT PRIMARY KEY,
+                ran_at REAL NOT NULL,
+                next_due REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_crawl_state_due ON crawl_state(source, next_due)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_crawl_history_url ON crawl_history(url, fetched_at)')
+        self.conn.commit()
+
+    def record(self, outcome):
+        with self.lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def get(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT content_hash, records, next_due, first_seen, parser, scoped, status FROM crawl_state WHERE url = ?',
+                (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'content_hash': row[0],
+            'records': json.loads(row[1]) if row[1] is not None else None,
+            'next_due': row[2],
+            'first_seen': row[3],
+            'parser': row[4],
+            'scoped': bool(row[5]),
+            'status': row[6]
+        }
+
+    def estimate_change_rate(self, hashes, elapsed):
+        # Poisson estimator for changes seen only at fetch times (Cho & Garcia-Molina):
+        # with n fetch intervals and X intervals that changed, rate = -ln((n - X + 0.5) / (n + 0.5)) / (elapsed / n).
+        intervals = len(hashes) - 1
+        if intervals < 1 or elapsed <= 0:
+            return 0.0
+        changes = sum(1 for previous, current in zip(hashes, hashes[1:]) if previous != current)
+        if not changes:
+            return 0.0
+        return -math.log((intervals - changes + 0.5) / (intervals + 0.5)) * intervals / elapsed
+
+    def recrawl_interval(self, change_rate, age, min_interval):
+        # Pages never seen changing back off to twice their observed age.
+        interval = 1 / change_rate if change_rate > 0 else age * 2
+        return min(max(interval, min_interval), self.max_interval)
+
+    def record_fetch(self, url, source, status, etag, content_hash, records, min_interval=3600, parser=None, scoped=True):
+        now = time.time()
+        payload = json.dumps(records, ensure_ascii=False) if records is not None else None
+        with self.lock:
+            self.conn.execute('INSERT INTO crawl_history VALUES (?, ?, ?)', (url, now, content_hash))
+            history = self.conn.execute(
+                'SELECT fetched_at, content_hash FROM crawl_history WHERE url = ? ORDER BY fetched_at DESC LIMIT ?',
+                (url, self.history_size)
+            ).fetchall()[::-1]
+            self.conn.execute(
+                'DELETE FROM crawl_history WHERE url = ? AND fetched_at < ?', (url, history[0][0])
+            )
+            previous = self.conn.execute('SELECT first_seen FROM crawl_state WHERE url = ?', (url,)).fetchone()
+            first_seen = previous[0] if previous else now
+            hashes = [row[1] for row in history]
+            changed = len(hashes) > 1 and hashes[-2] != content_hash
+            change_rate = self.estimate_change_rate(hashes, now - history[0][0])
+            next_due = now + self.recrawl_interval(change_rate, now - first_seen, min_interval)
+            self.conn.execute('''
+                INSERT INTO crawl_state (url, source, status, etag, content_hash, records, parser, scoped, change_rate,
+                                         first_seen, fetched_at, changed_at, fetch_count, change_count, next_due)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1, 0, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    source = excluded.source, status = excluded.status, etag = excluded.etag,
+                    content_hash = excluded.content_hash, records = COALESCE(excluded.records, crawl_state.records),
+                    parser = COALESCE(excluded.parser, crawl_state.parser), scoped = excluded.scoped,
+                    change_rate = excluded.change_rate, fetched_at = excluded.fetched_at,
+                    changed_at = CASE WHEN ? THEN excluded.fetched_at ELSE crawl_state.changed_at END,
+                    fetch_count = crawl_state.fetch_count + 1,
+                    change_count = crawl_state.change_count + ?,
+                    next_due = excluded.next_due
+            ''', (url, source, status, etag, content_hash, payload, parser, int(scoped), change_rate,
+                  first_seen, now, now, next_due, changed, int(changed)))
+            self.conn.commit()
+
+    def record_failure(self, url, source, retry_after=3600, parser=None, scoped=True):
+        # The parser is kept so due_pages retries the page even if it never fetched successfully.
+        now = time.time()
+        with self.lock:
+            self.conn.execute('''
+                INSERT INTO crawl_state (url, source, status, parser, scoped, first_seen, fetched_at, next_due)
+                VALUES (?, ?, NULL, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    status = NULL, parser = COALESCE(excluded.parser, crawl_state.parser),
+                    fetched_at = excluded.fetched_at, next_due = excluded.next_due
+            ''', (url, source, parser, int(scoped), now, now, now + retry_after))
+            self.conn.commit()
+
+    def due_pages(self, source, now=None):
+        now = now or time.time()
+        with self.lock:
+            rows = self.conn.execute('''
+                SELECT url, parser, scoped, change_rate, fetched_at, next_due FROM crawl_state
+                WHERE source = ? AND parser IS NOT NULL AND next_due <= ?
+            ''', (source, now)).fetchall()
+        # Most likely to have changed first: P(change) = 1 - exp(-rate * staleness); ties go to the most overdue.
+        rows.sort(key=lambda row: (-(1 - math.exp(-row[3] * (now - row[4]))), row[5]))
+        return [{'url': row[0], 'parser': row[1], 'scoped': bool(row[2]), 'change_rate': row[3]} for row in rows]
+
+    def discovery_due(self, source, now=None):
+        now = now or time.time()
+        with self.lock:
+            row = self.conn.execute('SELECT next_due FROM crawl_discovery WHERE source = ?', (source,)).fetchone()
+        return row is None or row[0] <= now
+
+    def record_discovery(self, source, interval):
+        now = time.time()
+        with self.lock:
+            self.conn.execute('''
+                INSERT INTO crawl_discovery (source, ran_at, next_due) VALUES (?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET ran_at = excluded.ran_at, next_due = excluded.next_due
+            ''', (source, now, now + interval))
+            self.conn.commit()
+
+    def get_stats(self):
+        with self.lock:
+            tracked, due = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(next_due <= ?), 0) FROM crawl_state', (time.time(),)
+            ).fetchone()
+        return {
+            'tracked_urls': tracked,
+            'due_now': due,
+            'skipped': self.skipped,
+            'unchanged': self.unchanged,
+            'changed': self.changed,
+            'failed': self.failed
+        }
+
+class RobotsCache:
+    def __init__(self, session, rate_limiter, cache_path, ttl=86400, failure_ttl=600,
+                 user_agent='Educational Content Aggregator', deadline=None):
+        self.session = session
+        self.rate_limiter = rate_limiter
+        # Callable returning the crawl's time.monotonic() deadline, or None when the crawl has no budget.
+        self.deadline = deadline or (lambda: None)
+        self.cache_path = cache_path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.user_agent = user_agent
+        self.entries = {}
+        self.parsers = {}
+        self.decisions = {}
+        self.lock = threading.Lock()
+        self.host_locks = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _save(self):
+        tmp_path = f"{self.cache_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_path)
+
+    @staticmethod
+    def _failed(entry):
+        return entry['status'] is None or entry['status'] >= 500
+
+    def _is_fresh(self, netloc):
+        entry = self.entries.get(netloc)
+        if entry is None:
+            return False
+        # A robots.txt we could not read is retried soon rather than trusted for a day.
+        ttl = self.failure_ttl if self._failed(entry) else self.ttl
+        return time.time() - entry['fetched_at'] < ttl
+
+    def _fetch(self, scheme, netloc):
+        import requests
+        robots_url = f"{scheme}://{netloc}/robots.txt"
+        deadline = self.deadline()
+        if self.rate_limiter.acquire(robots_url, deadline) is None:
+            return None
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        timeout = 10 if deadline is None else min(10, max(deadline - time.monotonic(), 1))
+        try:
+            response = self.session.get(robots_url, timeout=timeout)
+            status, body = response.status_code, response.text if response.ok else ""
+        except requests.RequestException as e:
+            logger.warning(f"Could not fetch robots.txt for {netloc}: {e}")
+            status, body = None, ""
+        return {'fetched_at': time.time(), 'status': status, 'body': body}
+
+    def _parser(self, scheme, netloc):
+        with self.lock:
+            host_lock = self.host_locks.setdefault(netloc, threading.Lock())
+        with host_lock:
+            if not self._is_fresh(netloc):
+                entry = self._fetch(scheme, netloc)
+                if entry is not None:
+                    with self.lock:
+                        self.entries[netloc] = entry
+                        self.parsers.pop(netloc, None)
+                        self.decisions = {key: value for key, value in self.decisions.items() if key[0] != netloc}
+                        self._save()
+                elif netloc not in self.entries:
+                    # Out of time before this host's robots.txt was ever read: stay out, without caching that.
+                    from urllib.robotparser import RobotFileParser
+                    parser = RobotFileParser()
+                    parser.disallow_all = True
+                    return parser
+            parser = self.parsers.get(netloc)
+            if parser is None:
+                from urllib.robotparser import RobotFileParser
+                entry = self.entries[netloc]
+                parser = RobotFileParser()
+                if entry['status'] in (401, 403) or self._failed(entry):
+                    # Unreachable or erroring robots.txt: stay out, like RobotFileParser.read() does on 5xx.
+                    parser.disallow_all = True
+                elif entry['status'] is not None and 400 <= entry['status'] < 500:
+                    parser.allow_all = True
+                else:
+                    parser.parse(entry['body'].splitlines())
+                crawl_delay = parser.crawl_delay(self.user_agent)
+                if crawl_delay:
+                    self.rate_limiter.set_crawl_delay(netloc, crawl_delay)
+                self.parsers[netloc] = parser
+            return parser
+
+    def sitemaps(self, url):
+        parts = urlparse(url)
+        return self._parser(parts.scheme or 'https', parts.netloc).site_maps() or []
+
+    def can_fetch(self, url):
+        parts = urlparse(url)
+        key = (parts.netloc, parts.path or '/', parts.query)
+        decision = self.decisions.get(key)
+        if decision is not None and self._is_fresh(parts.netloc):
+            return decision
+        parser = self._parser(parts.scheme or 'https', parts.netloc)
+        decision = parser.can_fetch(self.user_agent, url)
+        self.decisions[key] = decision
+        return decision
+
+class CrawlFrontier:
+    def __init__(self, path, max_failures=3):
+        self.path = path
+        self.max_failures = max_failures
+        self.cycle = 0
+        self.queue = deque()
+        self.deferred = []
+        self.queued = set()
+        self.seen_pages = set()
+        self.seen_links = set()
+        self.failures = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.cycle = state.get('cycle', 0)
+        self.seen_pages = set(state.get('seen_pages', []))
+        self.seen_links = set(state.get('seen_links', []))
+        self.failures = state.get('failures', {})
+        for url, depth in state.get('queue', []):
+            self.push(url, depth)
+
+    def save(self):
+        state = {
+            'cycle': self.cycle,
+            'queue': list(self.queue) + self.deferred,
+            'seen_pages': sorted(self.seen_pages),
+            'seen_links': sorted(self.seen_links),
+            'failures': self.failures,
+            'saved_at': datetime.now().isoformat()
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def is_empty(self):
+        return not self.queue
+
+    def seed(self, urls):
+        self.cycle += 1
+        self.seen_pages.clear()
+        self.seen_links.clear()
+        self.failures.clear()
+        for url in urls:
+            self.push(url, 0)
+        logger.info(f"Starting crawl cycle {self.cycle} for {self.path} with {len(self.queue)} pages")
+
+    def push(self, url, depth):
+        key = normalize_url(url)
+        if key in self.seen_pages or key in self.queued:
+            return False
+        self.queue.append([url, depth])
+        self.queued.add(key)
+        return True
+
+    def pop(self):
+        if not self.queue:
+            return None
+        url, depth = self.queue.popleft()
+        key = normalize_url(url)
+        self.queued.discard(key)
+        self.seen_pages.add(key)
+        return url, depth
+
+    def requeue(self, url, depth, failed=False):
+        # Undoes pop() for a page that was not crawled. A page cut off by the deadline goes back to the front;
+        # a failed one is saved for the next run, and dropped for this cycle after max_failures attempts.
+        key = normalize_url(url)
+        if failed:
+            self.failures[key] = self.failures.get(key, 0) + 1
+            if self.failures[key] >= self.max_failures:
+                return False
+        self.seen_pages.discard(key)
+        self.queued.add(key)
+        if failed:
+            self.deferred.append([url, depth])
+        else:
+            self.queue.appendleft([url, depth])
+        return True
+
+    def see_link(self, url):
+        key = normalize_url(url)
+        if key in self.seen_links:
+            return False
+        self.seen_links.add(key)
+        return True
+
+class SitemapState:
+    def __init__(self, path):
+        self.path = path
+        self.urls = {}
+        self.sitemaps = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.urls = state.get('urls', {})
+            self.sitemaps = state.get('sitemaps', {})
+        except (OSError, ValueError):
+            pass
+
+    def is_new(self, url, lastmod):
+        return url not in self.urls or bool(lastmod and self.urls[url] != lastmod)
+
+    def mark(self, url, lastmod):
+        self.urls[url] = lastmod or ''
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'urls': self.urls, 'sitemaps': self.sitemaps}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+class LatencyHistogram:
+    BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation, capped at the largest one seen.
+        seen = 0
+        for bound, count in zip(self.BUCKETS + (self.max,), self.counts):
+            seen += count
+            if count and seen >= q * self.count:
+                return min(bound, self.max)
+        return self.max
+
+    def snapshot(self):
+        buckets = {}
+        seen = 0
+        for bound, count in zip(self.BUCKETS, self.counts):
+            seen += count
+            buckets[str(bound)] = seen
+        buckets['+Inf'] = self.count
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'mean': round(self.sum / self.count, 6) if self.count else 0.0,
+            'p50': round(self.quantile(0.5), 6),
+            'p95': round(self.quantile(0.95), 6),
+            'max': round(self.max, 6),
+            'buckets': buckets
+        }
+
+class Metrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+
+    def observe(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.observe(seconds)
+
+    def incr(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    @contextmanager
+    def timer(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'latency': {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+                'counters': {name: round(value, 6) for name, value in sorted(self.counters.items())}
+            }
+
+def collect_metrics(scraper, integrator):
+    scraper_metrics = scraper.metrics.snapshot()
+    integrator_metrics = integrator.metrics.snapshot()
+    cache = scraper.http_cache.get_stats()
+    crawl = scraper.crawl_state.get_stats()
+    rate_limits = scraper.rate_limiter.get_stats().values()
+    return {
+        'latency': dict(scraper_metrics['latency'], **integrator_metrics['latency']),
+        'counters': dict(scraper_metrics['counters'], **integrator_metrics['counters']),
+        'gauges': {
+            'cache_hit_ratio': cache['hit_ratio'],
+            'cache_bytes': cache['bytes'],
+            'crawl_pages_skipped': crawl['skipped'],
+            'crawl_pages_unchanged': crawl['unchanged'],
+            'rate_limiter_wait_seconds': round(sum(stats['wait_seconds'] for stats in rate_limits), 3)
+        }
+    }
+
+def format_prometheus(metrics, prefix='djangapp_scraper'):
+    lines = []
+    for name, histogram in metrics.get('latency', {}).items():
+        metric = f"{prefix}_{name}_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        for bound, count in histogram['buckets'].items():
+            lines.append(f'{metric}_bucket{{le="{bound}"}} {count}')
+        lines.append(f"{metric}_sum {histogram['sum']}")
+        lines.append(f"{metric}_count {histogram['count']}")
+    for name, value in metrics.get('counters', {}).items():
+        lines.append(f"# TYPE {prefix}_{name}_total counter")
+        lines.append(f"{prefix}_{name}_total {value}")
+    for name, value in metrics.get('gauges', {}).items():
+        lines.append(f"# TYPE {prefix}_{name} gauge")
+        lines.append(f"{prefix}_{name} {value}")
+    return '\n'.join(lines) + '\n'
+
+def write_prometheus(path, metrics):
+    # Written atomically so a node_exporter textfile collector never reads a partial file.
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(format_prometheus(metrics))
+    os.replace(tmp_path, path)
+
+class ProgressEvents:
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        if self.stream is None:
+            return
+        line = json.dumps(dict(event=event, ts=round(time.time(), 3), **fields), ensure_ascii=False)
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+
+class NdjsonCourseWriter:
+    def __init__(self, path, index_every=50):
+        self.path = path
+        self.index_path = f"{os.path.splitext(path)[0]}.index.json"
+        self.index_every = index_every
+        self.lock = threading.Lock()
+        self.file = open(path, 'w', encoding='utf-8')
+        self.index = {
+            'started_at': datetime.now().isoformat(),
+            'total_courses': 0,
+            'topics': {},
+            'sources': {},
+            'scraper_version': '2.2'
+        }
+        self.pending = 0
+
+    def write(self, course):
+        line = json.dumps(course, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            self.index['total_courses'] += 1
+            source = course.get('source', '')
+            self.index['sources'][source] = self.index['sources'].get(source, 0) + 1
+            for category in course.get('categories', ['other']):
+                self.index['topics'][category] = self.index['topics'].get(category, 0) + 1
+            self.pending += 1
+            if self.pending >= self.index_every:
+                self._write_index()
+
+    def _write_index(self):
+        self.index['updated_at'] = datetime.now().isoformat()
+        self.index['bytes'] = self.file.tell()
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+        self.pending = 0
+
+    def close(self):
+        with self.lock:
+            if self.file.closed:
+                return
+            self._write_index()
+            self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class TopicSpecificScraper:
+    def __init__(self, output_dir="educational_courses", max_workers=None):
+        import requests
+        self.output_dir = output_dir
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': 'Educational Content Aggregator for Open Learning Resources',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        os.makedirs(self.output_dir, exist_ok=True)
+        self.TARGET_TOPICS = TOPIC_CONFIGURATIONS
+        self.topic_matcher = KeywordMatcher({
+            topic: config["french_keywords"] + config["english_keywords"]
+            for topic, config in self.TARGET_TOPICS.items()
+        })
+        self.source_results = {}
+        # Sources whose last discovery walk stopped at a per-run cap; their discovery stays due.
+        self.discovery_backlog = set()
+        self.deadline = None
+        self.hard_deadline = None
+        self.events = ProgressEvents()
+        self.metrics = Metrics()
+        self.rate_limiter = HostRateLimiter()
+        self.http_cache = HttpCache(os.path.join(self.output_dir, 'http_cache'))
+        self.robots = RobotsCache(self.session, self.rate_limiter, os.path.join(self.output_dir, 'robots_cache.json'),
+                                  deadline=lambda: self.deadline)
+        self.crawl_state = CrawlStateStore(os.path.join(self.output_dir, 'crawl_state.db'))
+        self.encodings = EncodingResolver()
+        self.cache_ttls = {}
+        for config in configured_sources().values():
+            netloc = urlparse(config['base_url']).netloc
+            self.rate_limiter.configure(netloc, **config.get('rate_limit', {}))
+            self.cache_ttls[netloc] = config.get('cache_ttl', 0)
+
+    def set_budget(self, budget_seconds, margin=None):
+        # Stop scheduling fetches a little before the hard limit so parsed courses can still be flushed.
+        margin = min(budget_seconds * 0.1, 15) if margin is None else margin
+        self.hard_deadline = time.monotonic() + budget_seconds
+        self.deadline = self.hard_deadline - margin
+
+    def stop(self):
+        self.deadline = time.monotonic()
+
+    def out_of_time(self):
+        return self.deadline is not None and time.monotonic() >= self.deadline
+
+    def request_timeout(self):
+        if self.hard_deadline is None:
+            return 25
+        return max(min(25, self.hard_deadline - time.monotonic()), 1)
+
+    @retry_on_request_errors
+    def fetch_document(self, url, source_name="Unknown", check_robots=True):
+        import requests
+        if check_robots:
+            with self.metrics.timer('robots'):
+                allowed = self.robots.can_fetch(url)
+            if not allowed and self.out_of_time():
+                return None
+            if not allowed:
+                self.metrics.incr('robots_blocked')
+                logger.warning(f"Robots.txt disallows {url}")
+                return None
+        cached = self.http_cache.get(url)
+        if cached and time.time() - cached['stored_at'] < self.cache_ttls.get(urlparse(url).netloc, 0):
+            self.http_cache.record('hits')
+            self.metrics.incr('cache_hits')
+            logger.info(f"Serving {url} from cache")
+            self.events.emit('page_fetched', name=source_name, url=url, status=200, bytes=len(cached['body']), cached=True)
+            return FetchedDocument(cached['body'], cached['encoding'], 200, cached['etag'])
+        if self.out_of_time():
+            return None
+        waited = self.rate_limiter.acquire(url, self.deadline)
+        if waited is None or self.out_of_time():
+            return None
+        self.metrics.observe('rate_limit_wait', waited)
+        logger.info(f"Fetching from {source_name}: {url}")
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.request_timeout(), headers=headers)
+            self.metrics.observe('fetch', time.perf_counter() - started)
+            if response.status_code == 304 and cached:
+                self.http_cache.record('revalidated')
+                self.metrics.incr('cache_revalidated')
+                self.http_cache.touch(url)
+                self.events.emit('page_fetched', name=source_name, url=url, status=304, bytes=len(cached['body']), cached=True)
+                return FetchedDocument(cached['body'], cached['encoding'], 304, cached['etag'])
+            response.raise_for_status()
+            self.http_cache.record('misses')
+            self.metrics.incr('cache_misses')
+            self.metrics.incr('bytes_downloaded', len(response.content))
+            encoding = self.encodings.resolve(url, response.headers.get('Content-Type'), response.content)
+            self.http_cache.put(
+                url, response.content, encoding,
+                response.headers.get('ETag'), response.headers.get('Last-Modified')
+            )
+            self.events.emit(
+                'page_fetched', name=source_name, url=url, status=response.status_code,
+                bytes=len(response.content), cached=False
+            )
+            return FetchedDocument(response.content, encoding, response.status_code, response.headers.get('ETag'))
+        except requests.RequestException as e:
+            self.metrics.incr('fetch_errors')
+            if is_transient_request_error(e) and not self.out_of_time():
+                logger.warning(f"Transient error fetching {url}: {e}")
+                raise
+            logger.error(f"Error fetching {url}: {e}")
+            return None
+
+    def fetch_page(self, url, source_name="Unknown"):
+        document = self.fetch_document(url, source_name)
+        if document is None:
+            return None
+        return document.body.decode(document.encoding or 'utf-8', errors='replace')
+
+    def check_robots_txt(self, base_url):
+        try:
+            with self.metrics.timer('robots'):
+                can_fetch = self.robots.can_fetch(base_url)
+            logger.info(f"Robots.txt check for {base_url}: {'Allowed' if can_fetch else 'Blocked'}")
+            return can_fetch
+        except Exception as e:
+            logger.warning(f"Could not check robots.txt for {base_url}: {e}")
+            return True
+
+    def parse_html(self, document, config, scoped=True):
+        parser = resolve_parser(config.get('parser', 'html.parser'))
+        parse_only = config.get('parse_only') if scoped else None
+        strainer = strainer_for(parse_only) if parse_only else None
+        from bs4 import BeautifulSoup
+        if isinstance(document, FetchedDocument):
+            return BeautifulSoup(document.body, parser, parse_only=strainer, from_encoding=document.encoding)
+        return BeautifulSoup(document, parser, parse_only=strainer)
+
+    def crawl_page(self, url, config, parse_page, scoped=True, force=False):
+        state = self.crawl_state.get(url)
+        if state and not force and time.time() < state['next_due']:
+            self.crawl_state.record('skipped')
+            records = state['records'] or []
+            self.events.emit('courses_found', name=config['name'], url=url, courses=len(records), fetched=False)
+            return records
+        document = self.fetch_document(url, config['name'])
+        if document is None and self.out_of_time():
+            return []
+        if document is None:
+            self.crawl_state.record('failed')
+            self.crawl_state.record_failure(url, config['name'], parser=parse_page.__name__, scoped=scoped)
+            return []
+        content_hash = hashlib.sha1(document.body).hexdigest()
+        min_interval = config.get('cache_ttl') or 3600
+        if state and state['records'] is not None and state['content_hash'] == content_hash:
+            self.crawl_state.record('unchanged')
+            self.crawl_state.record_fetch(url, config['name'], document.status, document.etag, content_hash, None,
+                                          min_interval, parse_page.__name__, scoped)
+            self.events.emit('courses_found', name=config['name'], url=url, courses=len(state['records']), fetched=True)
+            return state['records']
+        try:
+            with self.metrics.timer('parse'):
+                records = list(parse_page(self.parse_html(document, config, scoped), url, config))
+        except Exception as e:
+            logger.error(f"Error processing {config['name']} page {url}: {e}")
+            return []
+        self.crawl_state.record('changed')
+        self.crawl_state.record_fetch(url, config['name'], document.status, document.etag, content_hash, records,
+                                      min_interval, parse_page.__name__, scoped)
+        self.events.emit('courses_found', name=config['name'], url=url, courses=len(records), fetched=True)
+        return records
+
+    def match_topics(self, title, description=""):
+        return self.topic_matcher.match(f"{title} {description}")
+
+    def categorize_course(self, title, description=""):
+        with self.metrics.timer('categorize'):
+            categories = list(self.match_topics(title, description))
+        return categories if categories else ["other"]
+
+    def iter_sitemap(self, sitemap_url, source_name):
+        if not self.robots.can_fetch(sitemap_url):
+            logger.warning(f"Robots.txt disallows {sitemap_url}")
+            return
+        if self.out_of_time():
+            return
+        if self.rate_limiter.acquire(sitemap_url, self.deadline) is None or self.out_of_time():
+            return
+        logger.info(f"Streaming sitemap from {source_name}: {sitemap_url}")
+        with self.session.get(sitemap_url, timeout=self.request_timeout(), stream=True) as response:
+            response.raise_for_status()
+            gunzip = None
+            if urlparse(sitemap_url).path.endswith('.gz') and 'gzip' not in response.headers.get('Content-Encoding', ''):
+                gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            parser = ET.XMLPullParser(events=('end',))
+            for chunk in response.iter_content(chunk_size=65536):
+                parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+                for _, elem in parser.read_events():
+                    kind = elem.tag.rsplit('}', 1)[-1]
+                    if kind not in ('url', 'sitemap'):
+                        continue
+                    loc = lastmod = None
+                    for child in elem:
+                        name = child.tag.rsplit('}', 1)[-1]
+                        if name == 'loc':
+                            loc = (child.text or '').strip()
+                        elif name == 'lastmod':
+                            lastmod = (child.text or '').strip()
+                    elem.clear()
+                    if loc:
+                        yield kind, loc, lastmod
+            parser.close()
+
+    def discover_sitemap_pages(self, config):
+        import requests
+        base_url = config['base_url']
+        netloc = urlparse(base_url).netloc
+        sitemap_urls = [urljoin(base_url, path) for path in config.get('sitemaps', [])] or self.robots.sitemaps(base_url)
+        if not sitemap_urls:
+            return None
+        pattern = re.compile(config.get('sitemap_pattern', '.'))
+        limit = config.get('max_sitemap_pages_per_run', 10)
+        state = SitemapState(os.path.join(self.output_dir, f"sitemap_{netloc}.json"))
+        pending = deque((url, None) for url in sitemap_urls)
+        seen = set(sitemap_urls)
+        pages = []
+        readable = False
+        while pending and len(pages) < limit and not self.out_of_time():
+            sitemap_url, sitemap_lastmod = pending.popleft()
+            new_pages = 0
+            complete = True
+            try:
+                for kind, loc, lastmod in self.iter_sitemap(sitemap_url, config['name']):
+                    readable = True
+                    if kind == 'sitemap':
+                        if loc not in seen and not (lastmod and state.sitemaps.get(loc) == lastmod):
+                            seen.add(loc)
+                            pending.append((loc, lastmod))
+                    elif pattern.search(urlparse(loc).path) and state.is_new(loc, lastmod):
+                        if len(pages) >= limit:
+                            complete = False
+                            break
+                        pages.append((loc, lastmod))
+                        new_pages += 1
+            except (requests.RequestException, ET.ParseError, zlib.error) as e:
+                logger.warning(f"Could not read sitemap {sitemap_url}: {e}")
+                complete = False
+            if complete and not new_pages and sitemap_lastmod:
+                state.sitemaps[sitemap_url] = sitemap_lastmod
+        if not readable:
+            return None
+        if pending or len(pages) >= limit:
+            self.discovery_backlog.add(config['name'])
+        logger.info(f"Sitemap discovery for {config['name']}: {len(pages)} new or changed pages")
+        state.save()
+        return state, pages
+
+    def scrape_discovered_pages(self, config, discovered, parse_page):
+        state, pages = discovered
+        for url, lastmod in pages:
+            if self.out_of_time():
+                break
+            yield from self.crawl_page(url, config, parse_page, scoped=False, force=True)
+            if self.out_of_time():
+                break
+            # Failed pages stay unmarked so the next discovery offers them again.
+            fetched = self.crawl_state.get(url)
+            if fetched is None or fetched['status'] is None:
+                continue
+            state.mark(url, lastmod)
+            state.save()
+
+    def parse_fun_mooc_course_page(self, soup, url, config):
+        title_elem = soup.select_one('h1, .subheader__title, .course-detail__title')
+        if not title_elem:
+            return
+        title = title_elem.get_text(strip=True)
+        meta_desc = soup.select_one('meta[name="description"], meta[property="og:description"]')
+        description = meta_desc.get('content', '').strip() if meta_desc else ""
+        if not description:
+            desc_elem = soup.select_one('.course-detail__content, .course-introduction, .description')
+            description = desc_elem.get_text(strip=True) if desc_elem else ""
+        categories = self.categorize_course(title, description[:300])
+        if categories == ["other"]:
+            return
+        yield {
+            'source': config['name'],
+            'title': title,
+            'url': url,
+            'description': description[:300],
+            'categories': categories,
+            'license': config['license'],
+            'scraped_at': datetime.now().isoformat()
+        }
+
+    def scrape_fun_mooc(self, config):
+        base_url = config['base_url']
+        if not self.check_robots_txt(base_url):
+            logger.warning(f"Robots.txt blocks scraping for {base_url}")
+            return
+        if config.get('discovery') == 'sitemap':
+            discovered = self.discover_sitemap_pages(config)
+            if discovered is not None:
+                yield from self.scrape_discovered_pages(config, discovered, self.parse_fun_mooc_course_page)
+                return
+
+        for search_endpoint in config.get('search_endpoints', []):
+            yield from self.crawl_page(urljoin(base_url, search_endpoint), config, self.parse_fun_mooc_search_page)
+
+    def parse_fun_mooc_search_page(self, soup, url, config):
+        base_url = config['base_url']
+        course_cards = soup.select('.course-glimpse, .course-card, .course-item') or []
+        for card in course_cards[:8]:
+            try:
+                title_elem = card.select_one('h3, .course-title, .course-glimpse-content h3')
+                link_elem = card.select_one('a')
+                desc_elem = card.select_one('.course-glimpse-content__description, .description')
+                if title_elem and link_elem:
+                    title = title_elem.get_text(strip=True)
+                    course_url = urljoin(base_url, link_elem.get('href', ''))
+                    description = desc_elem.get_text(strip=True)[:300] if desc_elem else ""
+                    categories = self.categorize_course(title, description)
+                    if categories != ["other"]:
+                        yield {
+                            'source': config['name'],
+                            'title': title,
+                            'url': course_url,
+                            'description': description,
+                            'categories': categories,
+                            'license': config['license'],
+                            'scraped_at': datetime.now().isoformat()
+                        }
+            except Exception as e:
+                logger.error(f"Error processing FUN-MOOC course card: {e}")
+
+    def open_frontier(self, config):
+        netloc = urlparse(config['base_url']).netloc
+        return CrawlFrontier(os.path.join(self.output_dir, f"frontier_{netloc}.json"))
+
+    def wiki_title(self, url):
+        path = unquote(urlparse(url).path)
+        return path.split('/wiki/', 1)[1] if '/wiki/' in path else None
+
+    def is_wiki_category(self, title):
+        return bool(title) and title.split(':', 1)[0] in CATEGORY_NAMESPACES
+
+    def query_mediawiki_api(self, config, params):
+        api_url = urljoin(config['base_url'], config.get('api_path', '/w/api.php'))
+        params = dict(params, action='query', format='json', formatversion=2, maxlag=5)
+        continuation = {}
+        while True:
+            url = f"{api_url}?{urlencode(dict(params, **continuation))}"
+            # The API is the access path MediaWiki asks bots to use, so robots.txt rules for /w/ do not apply here.
+            document = self.fetch_document(url, config['name'], check_robots=False)
+            if not document:
+                return
+            try:
+                data = json.loads(document.body.decode(document.encoding or 'utf-8'))
+            except ValueError as e:
+                logger.error(f"Invalid MediaWiki API response from {url}: {e}")
+                return
+            if 'error' in data:
+                logger.error(f"MediaWiki API error from {url}: {data['error'].get('info', data['error'])}")
+                return
+            yield data
+            if 'continue' not in data:
+                return
+            continuation = data['continue']
+
+    def scrape_mediawiki_api(self, config, categories):
+        max_depth = config.get('max_depth', 0)
+        pending = deque((category, 0) for category in categories)
+        seen_categories = set(categories)
+        seen_pages = set()
+        while pending and not self.out_of_time():
+            category, depth = pending.popleft()
+            batch = {}
+            # TextExtracts returns at most 20 intro extracts per response. Asking the generator for more
+            # members only adds excontinue round trips before a batch completes, so both limits match.
+            for data in self.query_mediawiki_api(config, {
+                'generator': 'categorymembers',
+                'gcmtitle': category,
+                'gcmtype': 'page|subcat',
+                'gcmlimit': MEDIAWIKI_EXTRACTS_LIMIT,
+                'prop': 'extracts|info',
+                'exintro': 1,
+                'explaintext': 1,
+                'exchars': 300,
+                'exlimit': MEDIAWIKI_EXTRACTS_LIMIT,
+                'inprop': 'url'
+            }):
+                for page in data.get('query', {}).get('pages', []):
+                    merged = batch.setdefault(page['pageid'], {})
+                    merged.update({key: value for key, value in page.items() if value not in (None, '')})
+                if not data.get('batchcomplete'):
+                    continue
+                for page in batch.values():
+                    title = page.get('title', '')
+                    if page.get('ns') == 14:
+                        if depth < max_depth and title not in seen_categories:
+                            seen_categories.add(title)
+                            pending.append((title, depth + 1))
+                        continue
+                    if page['pageid'] in seen_pages or len(title) <= 5:
+                        continue
+                    seen_pages.add(page['pageid'])
+                    description = ' '.join(page.get('extract', '').split())[:300]
+                    categories_found = self.categorize_course(title, description)
+                    if categories_found != ["other"]:
+                        yield {
+                            'source': config['name'],
+                            'title': title,
+                            'url': page.get('fullurl') or urljoin(config['base_url'], f"/wiki/{title.replace(' ', '_')}"),
+                            'description': description,
+                            'categories': categories_found,
+                            'license': config['license'],
+                            'scraped_at': datetime.now().isoformat()
+                        }
+                batch = {}
+
+    def scrape_wikiversity(self, config):
+        base_url = config['base_url']
+        if not self.check_robots_txt(base_url):
+            return
+        seeds = [urljoin(base_url, path) for path in config.get('categories', []) + config.get('sections', [])]
+        if config.get('mode') == 'api':
+            categories = [self.wiki_title(url) for url in seeds if self.is_wiki_category(self.wiki_title(url))]
+            yield from self.scrape_mediawiki_api(config, categories)
+            seeds = [url for url in seeds if not self.is_wiki_category(self.wiki_title(url))]
+        if not seeds:
+            return
+        yield from self.crawl_wikiversity_pages(config, seeds)
+
+    def crawl_wikiversity_pages(self, config, seeds):
+        base_url = config['base_url']
+        frontier = self.open_frontier(config)
+        if frontier.is_empty():
+            frontier.seed(seeds)
+        max_depth = config.get('max_depth', 0)
+        pages_left = config.get('max_pages_per_run', 25)
+        while pages_left > 0 and not frontier.is_empty() and not self.out_of_time():
+            url, depth = frontier.pop()
+            pages_left -= 1
+            document = self.fetch_document(url, config['name'])
+            if not document:
+                frontier.requeue(url, depth, failed=not self.out_of_time())
+                frontier.save()
+                continue
+            with self.metrics.timer('parse'):
+                soup = self.parse_html(document, config)
+            if depth < max_depth:
+                for link in soup.select('#mw-subcategories a'):
+                    if link.get('href'):
+                        frontier.push(urljoin(base_url, link['href']), depth + 1)
+            course_links = soup.select('#mw-pages a, .mw-category-group a, .NavContent a') or []
+            for link in course_links:
+                try:
+                    href = link.get('href')
+                    title = link.get_text(strip=True)
+                    if not href or link.find_parent(id='mw-subcategories'):
+                        continue
+                    full_url = urljoin(base_url, href)
+                    if 'pagefrom=' in href or 'pageuntil=' in href:
+                        if 'pagefrom=' in href:
+                            frontier.push(full_url, depth)
+                        continue
+                    if title and len(title) > 5 and frontier.see_link(full_url):
+                        categories = self.categorize_course(title)
+                        if categories != ["other"]:
+                            yield {
+                                'source': config['name'],
+                                'title': title,
+                                'url': full_url,
+                                'description': '',
+                                'categories': categories,
+                                'license': config['license'],
+                                'scraped_at': datetime.now().isoformat()
+                            }
+                except Exception as e:
+                    logger.error(f"Error processing Wikiversity link: {e}")
+            frontier.save()
+        if not frontier.is_empty() or frontier.deferred:
+            self.discovery_backlog.add(config['name'])
+
+    def parse_mit_course_page(self, soup, url, config):
+        title_elem = soup.select_one('h1, .course-title, .course-header--title')
+        if not title_elem:
+            return
+        title = title_elem.get_text(strip=True)
+        materials = []
+        for link in soup.select('a[href*=".pdf"], a[href*="download"]'):
+            href = link.get('href')
+            link_text = link.get_text(strip=True)
+            if href and any(keyword in href.lower() for keyword in ['lecture', 'assignment', 'reading']):
+                materials.append({
+                    'title': link_text,
+                    'url': urljoin(url, href),
+                    'type': 'pdf'
+                })
+        desc_elem = soup.select_one('.course-description, .course-info')
+        description = desc_elem.get_text(strip=True)[:400] if desc_elem else ""
+        categories = self.categorize_course(title, description)
+        if categories == ["other"]:
+            return
+        yield {
+            'source': config['name'],
+            'title': title,
+            'url': url,
+            'description': description,
+            'materials': materials,
+            'categories': categories,
+            'license': config['license'],
+            'scraped_at': datetime.now().isoformat()
+        }
+
+    def scrape_mit_ocw(self, config):
+        base_url = config['base_url']
+        if not self.check_robots_txt(base_url):
+            return
+        if config.get('discovery') == 'sitemap':
+            discovered = self.discover_sitemap_pages(config)
+            if discovered is not None:
+                yield from self.scrape_discovered_pages(config, discovered, self.parse_mit_course_page)
+                return
+        for search in config.get('course_searches', []):
+            url = urljoin(base_url, search)
+            parse_page = self.parse_mit_search_page if '/search/' in url else self.parse_mit_course_page
+            yield from self.crawl_page(url, config, parse_page)
+
+    def parse_mit_search_page(self, soup, url, config):
+        search_results = soup.select('.course-title a, .search-result h3 a') or []
+        for link in search_results[:5]:
+            title = link.get_text(strip=True)
+            course_url = urljoin(config['base_url'], link.get('href', ''))
+            categories = self.categorize_course(title)
+            if categories != ["other"]:
+                yield {
+                    'source': config['name'],
+                    'title': title,
+                    'url': course_url,
+                    'description': '',
+                    'categories': categories,
+                    'license': config['license'],
+                    'scraped_at': datetime.now().isoformat()
+                }
+
+    def scrape_openclassrooms(self, config):
+        base_url = config['base_url']
+        if not self.check_robots_txt(base_url):
+            return
+        for term in config.get('search_terms', []):
+            yield from self.crawl_page(f"{base_url}/search/?q={term}", config, self.parse_openclassrooms_page)
+
+    def parse_openclassrooms_page(self, soup, url, config):
+        base_url = config['base_url']
+        course_cards = soup.select('.course-card, .courseCard, .search-result') or []
+        for card in course_cards[:6]:
+            try:
+                title_elem = card.select_one('h3, .title, .course-title')
+                link_elem = card.select_one('a')
+                if title_elem and link_elem:
+                    title = title_elem.get_text(strip=True)
+                    course_url = urljoin(base_url, link_elem.get('href', ''))
+                    free_indicators = card.select('.free, .gratuit, .premium-free')
+                    if free_indicators or 'gratuit' in card.get_text().lower():
+                        categories = self.categorize_course(title)
+                        if categories != ["other"]:
+                            yield {
+                                'source': config['name'],
+                                'title': title,
+                                'url': course_url,
+                                'description': '',
+                                'categories': categories,
+                                'license': config['license'],
+                                'is_free': True,
+                                'scraped_at': datetime.now().isoformat()
+                            }
+            except Exception as e:
+                logger.error(f"Error processing OpenClassrooms course: {e}")
+
+    def scrape_france_ioi(self, config):
+        base_url = config['base_url']
+        if not self.check_robots_txt(base_url):
+            return
+        for section in config.get('sections', []):
+            yield from self.crawl_page(urljoin(base_url, section), config, self.parse_france_ioi_page)
+
+    def parse_france_ioi_page(self, soup, url, config):
+        base_url = config['base_url']
+        course_links = soup.select('a[href*="/algo/"], a[href*="/cours/"]') or []
+        for link in course_links[:10]:
+            try:
+                href = link.get('href')
+                title = link.get_text(strip=True)
+                if href and title and len(title) > 5:
+                    categories = self.categorize_course(title)
+                    if categories != ["other"]:
+                        full_url = urljoin(base_url, href)
+                        yield {
+                            'source': config['name'],
+                            'title': title,
+                            'url': full_url,
+                            'description': '',
+                            'categories': categories,
+                            'license': config['license'],
+                            'scraped_at': datetime.now().isoformat()
+                        }
+            except Exception as e:
+                logger.error(f"Error processing France IOI link: {e}")
+
+    def get_source_scraper(self, source_name):
+        if source_name == "fun_mooc":
+            return self.scrape_fun_mooc
+        if source_name.startswith("wikiversity"):
+            return self.scrape_wikiversity
+        if source_name == "mit_ocw":
+            return self.scrape_mit_ocw
+        if source_name == "openclassrooms":
+            return self.scrape_openclassrooms
+        if source_name == "france_ioi":
+            return self.scrape_france_ioi
+        return None
+
+    def source_for_url(self, url):
+        netloc = urlparse(url).netloc.lower()
+        for source_name, config in configured_sources().items():
+            if urlparse(config['base_url']).netloc.lower() == netloc:
+                return source_name, config
+        return None, None
+
+    def page_parser_for(self, url, config):
+        state = self.crawl_state.get(url)
+        if state and state['parser']:
+            return getattr(self, state['parser'], None), state['scoped']
+        parser_name = config.get('page_parser')
+        return (getattr(self, parser_name, None) if parser_name else None), False
+
+    def enabled_sources(self):
+        enabled = []
+        for source_name, config in configured_sources().items():
+            if not config.get('allowed', False):
+                logger.warning(f"Skipping {source_name} as it is not allowed")
+                continue
+            enabled.append((source_name, config))
+        return enabled
+
+    def iter_due_pages(self, source_name, config):
+        # Discovery (sitemaps, category walks, listing pages) is scheduled on its own, so a refresh still finds
+        # new courses; pages it already recorded are refetched below as they fall due.
+        if self.crawl_state.discovery_due(config['name']):
+            scraper = self.get_source_scraper(source_name)
+            self.discovery_backlog.discard(config['name'])
+            if scraper is not None:
+                yield from scraper(config)
+            if self.out_of_time():
+                logger.info(f"Time budget spent while discovering {config['name']}")
+                return
+            backlog = config['name'] in self.discovery_backlog
+            self.crawl_state.record_discovery(config['name'], 0 if backlog else config.get('cache_ttl') or 3600)
+        for page in self.crawl_state.due_pages(config['name']):
+            if self.out_of_time():
+                logger.info(f"Time budget spent while refreshing {config['name']}")
+                return
+            parse_page = getattr(self, page['parser'], None)
+            if parse_page is not None:
+                yield from self.crawl_page(page['url'], config, parse_page, page['scoped'], force=True)
+
+    def iter_source(self, source_name, config, scraper=None):
+        started = time.monotonic()
+        count = 0
+        error = None
+        scraper = scraper or self.get_source_scraper(source_name)
+        self.events.emit('source_started', source=source_name, name=config['name'])
+        if scraper is not None:
+            try:
+                for course in scraper(config):
+                    count += 1
+                    yield course
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Error scraping {source_name}: {e}")
+        duration = time.monotonic() - started
+        self.source_results[source_name] = {
+            'courses': count,
+            'error': error,
+            'duration': round(duration, 2)
+        }
+        logger.info(f"Finished {source_name}: {count} courses in {duration:.1f}s")
+        self.events.emit('source_finished', source=source_name, **self.source_results[source_name])
+
+    def scrape_source(self, source_name, config, on_course=None):
+        courses = []
+        for course in self.iter_source(source_name, config):
+            if on_course is not None:
+                on_course(course)
+            courses.append(course)
+        return courses
+
+    def scrape_all_sources(self, concurrent=True, on_course=None):
+        enabled = self.enabled_sources()
+        self.source_results = {}
+        results = {}
+        if concurrent and len(enabled) > 1:
+            workers = self.max_workers or len(enabled)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="source") as executor:
+                futures = {
+                    executor.submit(self.scrape_source, source_name, config, on_course): source_name
+                    for source_name, config in enabled
+                }
+                for future in as_completed(futures):
+                    results[futures[future]] = future.result()
+        else:
+            for source_name, config in enabled:
+                results[source_name] = self.scrape_source(source_name, config, on_course)
+        courses = []
+        for source_name, _ in enabled:
+            courses.extend(results[source_name])
+        return courses
+
+    def save_courses_to_json(self, all_courses, filename="topic_courses.json"):
+        filepath = os.path.join(self.output_dir, filename)
+        by_topic = {}
+        sources = {}
+        for course in all_courses:
+            source = course['source']
+            sources[source] = sources.get(source, 0) + 1
+            for category in course.get('categories', ['other']):
+                if category not in by_topic:
+                    by_topic[category] = []
+                by_topic[category].append(course)
+        output_data = {
+            'scraping_metadata': {
+                'scraped_at': datetime.now().isoformat(),
+                'total_courses': len(all_courses),
+                'sources': sources,
+                'topics': {topic: len(courses) for topic, courses in by_topic.items()},
+                'target_topics': list(self.TARGET_TOPICS.keys()),
+                'scraper_version': '2.2'
+            },
+            'courses_by_topic': by_topic,
+            'all_courses': all_courses
+        }
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        logger.info(f"Results saved to {filepath}")
+        return filepath
+
+    def open_course_stream(self, filename="topic_courses.ndjson"):
+        return NdjsonCourseWriter(os.path.join(self.output_dir, filename))
+
+    def generate_topic_report(self, courses):
+        summary = CourseSummary()
+        for course in courses:
+            summary.add(course)
+        self.print_topic_report(summary)
+
+    def print_topic_report(self, summary):
+        if not summary.total:
+            print("No courses found.", file=sys.stderr)
+            return
+        print(f"\n💻 EDUCATIONAL COURSES REPORT", file=sys.stderr)
+        print(f"Topics: PC Basics, Programming, English Learning", file=sys.stderr)
+        print(f"{'='*60}", file=sys.stderr)
+        print(f"Total courses found: {summary.total}", file=sys.stderr)
+        topic_names = {
+            'computer_basics': '🖥️  PC Basics & Computer Skills',
+            'programming': '💻 Programming & Development',
+            'english_learning': '🇬🇧 English Learning',
+            'other': '📚 Other Relevant Courses'
+        }
+        print(f"\nCourses by Topic:", file=sys.stderr)
+        for topic, count in summary.by_topic.items():
+            display_name = topic_names.get(topic, topic.title())
+            print(f"  {display_name}: {count} courses", file=sys.stderr)
+        print(f"\nCourses by Source:", file=sys.stderr)
+        for source, count in sorted(summary.by_source.items(), key=lambda x: x[1], reverse=True):
+            print(f"  • {source}: {count} courses", file=sys.stderr)
+        print(f"\nSample Courses by Topic:", file=sys.stderr)
+        for topic, samples in summary.samples.items():
+            if samples:
+                count = summary.by_topic[topic]
+                display_name = topic_names.get(topic, topic.title())
+                print(f"\n{display_name}:", file=sys.stderr)
+                for i, course in enumerate(samples):
+                    print(f"  {i+1}. {course['title']}", file=sys.stderr)
+                    print(f"     Source: {course['source']}", file=sys.stderr)
+                    print(f"     URL: {course['url']}", file=sys.stderr)
+                    if count > 3:
+                        print(f"     ... and {count - 3} more", file=sys.stderr)
+                        break
+
+class CourseSummary:
+    def __init__(self, sample_size=3):
+        self.sample_size = sample_size
+        self.total = 0
+        self.by_topic = {}
+        self.by_source = {}
+        self.samples = {}
+        self.modules_breakdown = {}
+
+    def add(self, course):
+        self.total += 1
+        for category in course.get('categories', ['other']):
+            self.by_topic[category] = self.by_topic.get(category, 0) + 1
+            samples = self.samples.setdefault(category, [])
+            if len(samples) < self.sample_size:
+                samples.append({'title': course['title'], 'source': course['source'], 'url': course['url']})
+        source = course['source']
+        self.by_source[source] = self.by_source.get(source, 0) + 1
+        module_id = course.get('module_id')
+        if module_id:
+            self.modules_breakdown[module_id] = self.modules_breakdown.get(module_id, 0) + 1
+
+_PIPELINE_DONE = object()
+
+class ScrapePipeline:
+    def __init__(self, scraper, integrator, stream=None, batch_size=50, queue_size=200, flush_interval=2.0):
+        self.scraper = scraper
+        self.integrator = integrator
+        self.stream = stream
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.flush_interval = flush_interval
+        self.summary = CourseSummary()
+        self.integrated = 0
+        self.errors = []
+        self.refresh = False
+
+    def run(self, sources=None, refresh=False):
+        self.refresh = refresh
+        if sources is None:
+            sources = self.scraper.enabled_sources()
+        self.scraper.source_results = {}
+        course_queue = queue.Queue(maxsize=self.queue_size)
+        persist_queue = queue.Queue(maxsize=self.queue_size)
+        categorizer = threading.Thread(
+            target=self._categorize, args=(course_queue, persist_queue), name="categorize", daemon=True
+        )
+        categorizer.start()
+        workers = self.scraper.max_workers or max(len(sources), 1)
+        producers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="source")
+        futures = [producers.submit(self._produce, source_name, config, course_queue) for source_name, config in sources]
+        closer = threading.Thread(
+            target=self._close_sources, args=(producers, futures, course_queue), name="sources", daemon=True
+        )
+        closer.start()
+        self._persist(persist_queue)
+        categorizer.join()
+        closer.join()
+        return self.summary
+
+    def _produce(self, source_name, config, course_queue):
+        scraper = None
+        if self.refresh:
+            scraper = partial(self.scraper.iter_due_pages, source_name)
+        for course in self.scraper.iter_source(source_name, config, scraper):
+            course_queue.put(course)
+
+    def _close_sources(self, producers, futures, course_queue):
+        for future in futures:
+            try:
+                future.result()
+            except Exception as e:
+                logger.error(f"Source worker failed: {e}")
+        producers.shutdown()
+        course_queue.put(_PIPELINE_DONE)
+
+    def _categorize(self, course_queue, persist_queue):
+        while True:
+            course = course_queue.get()
+            if course is _PIPELINE_DONE:
+                persist_queue.put(_PIPELINE_DONE)
+                return
+            try:
+                course['module_id'] = self.integrator.categorize_for_djangapp(course)
+                self.summary.add(course)
+                if self.stream is not None:
+                    self.stream.write(course)
+            except Exception as e:
+                logger.error(f"Error categorizing course {course.get('title', '')}: {e}")
+                continue
+            persist_queue.put(course)
+
+    def _persist(self, persist_queue):
+        batch = []
+        flush_at = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                course = persist_queue.get(timeout=max(flush_at - time.monotonic(), 0.05))
+            except queue.Empty:
+                course = None
+            if course is _PIPELINE_DONE:
+                self._flush(batch)
+                return
+            if course is not None:
+                batch.append(course)
+            if len(batch) >= self.batch_size or time.monotonic() >= flush_at:
+                self._flush(batch)
+                batch = []
+                flush_at = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        integrated_count, errors = self.integrator.integrate_scraped_courses(batch)
+        self.integrated += integrated_count
+        self.errors.extend(errors)
+        self.scraper.events.emit(
+            'batch_committed', courses=len(batch), integrated=integrated_count,
+            total_integrated=self.integrated, errors=len(errors)
+        )
+
+class QuizEngine:
+    FIELD_PATTERN = re.compile(r'@@(\w+)@@')
+
+    def __init__(self, templates=QUIZ_TEMPLATES, keyword_question=QUIZ_KEYWORD_QUESTION, default_module="informatique"):
+        self.default_module = default_module
+        self.compiled = {}
+        for module_id, template in templates.items():
+            with_keyword = dict(template, questions=template['questions'] + [keyword_question])
+            self.compiled[module_id] = (self.compile(template), self.compile(with_keyword))
+
+    def compile(self, template):
+        # Alternating literal JSON and field names; rendering is a join, so no template is ever mutated.
+        return tuple(self.FIELD_PATTERN.split(json.dumps(template, ensure_ascii=False)))
+
+    @staticmethod
+    def escape(value):
+        return json.dumps(value, ensure_ascii=False)[1:-1]
+
+    def render(self, title, description, module_id, keyword=None, distractors=()):
+        # Without an indexed keyword the keyword question is left out rather than guessed from the text.
+        plain, with_keyword = self.compiled.get(module_id) or self.compiled[self.default_module]
+        fields = {'title': self.escape(title), 'title_lower': self.escape(title.lower())}
+        parts = plain
+        if keyword:
+            fields['keyword'] = self.escape(keyword)
+            options = list(distractors)[:3] + list(QUIZ_DEFAULT_DISTRACTORS[len(distractors):])
+            for number, option in enumerate(options, 1):
+                fields[f'distractor_{number}'] = self.escape(option)
+            parts = with_keyword
+        return ''.join(fields[part] if index % 2 else part for index, part in enumerate(parts))
+
+    def render_batch(self, items):
+        # items are (title, description, module_id[, keyword, distractors]) tuples; returns quiz JSON in order.
+        return [self.render(*item) for item in items]
+
+class KeywordIndex:
+    # TF-IDF over the title and description of every lesson in app.db. Document frequencies live in
+    # term_stats and each lesson's term counts in course_terms, so only added or edited lessons are
+    # re-tokenized and the cost of an update follows the size of the delta.
+    TOKEN_PATTERN = re.compile(r'[^\W\d_]{4,}')
+
+    def __init__(self, top_k=5, pool_size=200, chunk_size=500):
+        self.top_k = top_k
+        self.pool_size = pool_size
+        self.chunk_size = chunk_size
+        self.synced = False
+
+    def init_tables(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS term_stats (
+                term TEXT PRIMARY KEY,
+                df INTEGER NOT NULL
+            )
+        ''')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS course_terms (
+                lesson_id TEXT PRIMARY KEY,
+                module_id TEXT,
+                content_hash TEXT,
+                terms TEXT NOT NULL,
+                keywords TEXT NOT NULL DEFAULT '[]'
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_course_terms_module ON course_terms(module_id, lesson_id)')
+
+    def tokenize(self, text):
+        return Counter(term for term in self.TOKEN_PATTERN.findall(text.lower()) if term not in KEYWORD_STOPWORDS)
+
+    def _stored_terms(self, conn, lesson_ids):
+        stored = {}
+        for start in range(0, len(lesson_ids), 900):
+            chunk = lesson_ids[start:start + 900]
+            placeholders = ','.join('?' * len(chunk))
+            for lesson_id, content_hash, terms in conn.execute(
+                f"SELECT lesson_id, content_hash, terms FROM course_terms WHERE lesson_id IN ({placeholders})", chunk
+            ):
+                stored[lesson_id] = (content_hash, Counter(json.loads(terms)))
+        return stored
+
+    def _document_frequencies(self, conn, terms):
+        frequencies = {}
+        for start in range(0, len(terms), 900):
+            chunk = terms[start:start + 900]
+            placeholders = ','.join('?' * len(chunk))
+            frequencies.update(conn.execute(f"SELECT term, df FROM term_stats WHERE term IN ({placeholders})", chunk))
+        return frequencies
+
+    def _apply_delta(self, conn, delta):
+        conn.executemany(
+            'INSERT INTO term_stats (term, df) VALUES (?, ?) ON CONFLICT(term) DO UPDATE SET df = df + excluded.df',
+            [(term, count) for term, count in delta.items() if count]
+        )
+        conn.executemany('DELETE FROM term_stats WHERE term = ? AND df <= 0',
+                         [(term,) for term, count in delta.items() if count < 0])
+
+    def _index(self, conn, documents):
+        # documents are (lesson_id, module_id, content_hash, title, description); returns [(lesson_id, term counts)].
+        previous = self._stored_terms(conn, [document[0] for document in documents])
+        delta = Counter()
+        indexed = []
+        rows = []
+        for lesson_id, module_id, content_hash, title, description in documents:
+            old_hash, old_terms = previous.get(lesson_id, (None, None))
+            if old_terms is not None and old_hash == content_hash:
+                indexed.append((lesson_id, old_terms))
+                continue
+            terms = self.tokenize(f"{title or ''} {description or ''}")
+            delta.update(terms.keys())
+            if old_terms is not None:
+                delta.subtract(old_terms.keys())
+            indexed.append((lesson_id, terms))
+            rows.append((lesson_id, module_id, content_hash, json.dumps(terms, ensure_ascii=False)))
+        self._apply_delta(conn, delta)
+        conn.executemany(
+            "INSERT OR REPLACE INTO course_terms (lesson_id, module_id, content_hash, terms, keywords) "
+            "VALUES (?, ?, ?, ?, '[]')", rows
+        )
+        return indexed
+
+    def _score(self, conn, indexed, titles):
+        # Words of the title stay in the tf-idf counts but are never picked: a quiz answer copied from the
+        # question ("Avancé" for "Python avancé") tests nothing.
+        total = conn.execute('SELECT COUNT(*) FROM course_terms').fetchone()[0]
+        excluded = [self.tokenize(titles.get(lesson_id) or '') for lesson_id, _ in indexed]
+        keywords = self.extract_keywords(conn, [terms for _, terms in indexed], total, excluded)
+        conn.executemany('UPDATE course_terms SET keywords = ? WHERE lesson_id = ?', [
+            (json.dumps(top, ensure_ascii=False), lesson_id) for (lesson_id, _), top in zip(indexed, keywords)
+        ])
+        return keywords
+
+    def extract_keywords(self, conn, documents, total, excluded=None):
+        # documents are term Counters; returns each one's top_k terms by tf-idf, best first, ties by term,
+        # leaving out the terms in the matching entry of excluded.
+        excluded = excluded or [()] * len(documents)
+        vocabulary = sorted(set().union(*documents)) if documents else []
+        frequencies = self._document_frequencies(conn, vocabulary)
+        idf = [math.log((1 + total) / (1 + frequencies.get(term, 0))) + 1 for term in vocabulary]
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        if numpy is not None and vocabulary:
+            return self._extract_keywords_numpy(numpy, documents, vocabulary, idf, excluded)
+        idf_by_term = dict(zip(vocabulary, idf))
+        keywords = []
+        for counts, skip in zip(documents, excluded):
+            length = sum(counts.values())
+            ranked = sorted(counts, key=lambda term: (-(counts[term] / length) * idf_by_term[term], term))
+            keywords.append([term for term in ranked if term not in skip][:self.top_k])
+        return keywords
+
+    def _extract_keywords_numpy(self, np, documents, vocabulary, idf, excluded):
+        # The batch as one CSR matrix: a single vectorized tf-idf pass, then a top-k per row.
+        position = {term: index for index, term in enumerate(vocabulary)}
+        sizes = np.fromiter((len(counts) for counts in documents), dtype=np.int64, count=len(documents))
+        indptr = np.concatenate(([0], np.cumsum(sizes)))
+        nonzero = int(indptr[-1])
+        indices = np.fromiter((position[term] for counts in documents for term in counts), dtype=np.int64, count=nonzero)
+        data = np.fromiter((tf for counts in documents for tf in counts.values()), dtype=np.float64, count=nonzero)
+        lengths = np.fromiter((sum(counts.values()) for counts in documents), dtype=np.float64, count=len(documents))
+        scores = data / np.repeat(lengths, sizes) * np.asarray(idf, dtype=np.float64)[indices]
+        keywords = []
+        for row in range(len(documents)):
+            start, end = indptr[row], indptr[row + 1]
+            # vocabulary is sorted, so ordering by column index breaks ties by term like the pure-Python path
+            order = np.lexsort((indices[start:end], -scores[start:end]))
+            ranked = (vocabulary[column] for column in indices[start:end][order])
+            keywords.append([term for term in ranked if term not in excluded[row]][:self.top_k])
+        return keywords
+
+    def sync(self, conn):
+        # Brings the index in line with content: lessons written by other tools or earlier versions are
+        # tokenized first and scored once all document frequencies are in.
+        stale = conn.execute('''
+            SELECT content.lesson_id, content.module_id, content.content_hash, content.title, content.description
+            FROM content LEFT JOIN course_terms ON course_terms.lesson_id = content.lesson_id
+            WHERE course_terms.lesson_id IS NULL OR course_terms.content_hash IS NOT content.content_hash
+        ''').fetchall()
+        removed = conn.execute(
+            'SELECT lesson_id, terms FROM course_terms WHERE lesson_id NOT IN (SELECT lesson_id FROM content)'
+        ).fetchall()
+        if removed:
+            delta = Counter()
+            for _, terms in removed:
+                delta.subtract(json.loads(terms).keys())
+            self._apply_delta(conn, delta)
+            conn.executemany('DELETE FROM course_terms WHERE lesson_id = ?', [(row[0],) for row in removed])
+        for start in range(0, len(stale), self.chunk_size):
+            self._index(conn, stale[start:start + self.chunk_size])
+        titles = {row[0]: row[3] for row in stale}
+        lesson_ids = list(titles)
+        for start in range(0, len(lesson_ids), self.chunk_size):
+            stored = self._stored_terms(conn, lesson_ids[start:start + self.chunk_size])
+            self._score(conn, [(lesson_id, terms) for lesson_id, (_, terms) in stored.items()], titles)
+        self.synced = True
+        if stale or removed:
+            logger.info(f"Keyword index synced: {len(stale)} lessons indexed, {len(removed)} removed")
+
+    def sibling_keywords(self, conn, module_id):
+        # {term: lesson_ids} over the top keywords of a sample of the module; lesson_ids end in a content
+        # fingerprint, so ordering by them samples the module evenly.
+        candidates = {}
+        for lesson_id, keywords in conn.execute(
+            'SELECT lesson_id, keywords FROM course_terms WHERE module_id = ? ORDER BY lesson_id LIMIT ?',
+            (module_id, self.pool_size)
+        ):
+            for keyword in json.loads(keywords)[:2]:
+                candidates.setdefault(keyword, set()).add(lesson_id)
+        return candidates
+
+    def distractors_for(self, lesson_id, terms, candidates, count=3):
+        eligible = [term for term, owners in candidates.items() if term not in terms and owners != {lesson_id}]
+        # Stable per lesson so re-rendering an unchanged course gives the same quiz.
+        return heapq.nsmallest(count, eligible, key=lambda term: (zlib.crc32(f"{lesson_id}:{term}".encode('utf-8')), term))
+
+    def quiz_terms(self, conn, documents):
+        # Indexes the batch and returns {lesson_id: (keyword, distractors)} for lessons with a usable term.
+        if not documents:
+            return {}
+        indexed = self._index(conn, documents)
+        keywords = self._score(conn, indexed, {document[0]: document[3] for document in documents})
+        modules = {document[0]: document[1] for document in documents}
+        pools = {}
+        result = {}
+        for (lesson_id, terms), top in zip(indexed, keywords):
+            if not top:
+                continue
+            module_id = modules[lesson_id]
+            if module_id not in pools:
+                pools[module_id] = self.sibling_keywords(conn, module_id)
+            distractors = self.distractors_for(lesson_id, terms, pools[module_id])
+            result[lesson_id] = (top[0].capitalize(), [term.capitalize() for term in distractors])
+        return result
+
+class DjangAppIntegrator:
+    def __init__(self, db_path="database/app.db", batch_size=500):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.module_matcher = KeywordMatcher(DJANGAPP_MODULE_KEYWORDS)
+        self.conn = None
+        self.lock = threading.Lock()
+        self.last_ingest_report = []
+        self.ingest_totals = {'inserted': 0, 'updated': 0, 'skipped': 0}
+        self.metrics = Metrics()
+        self.quiz_engine = QuizEngine()
+        self.keyword_index = KeywordIndex()
+        self.init_database()
+
+    def connect(self):
+        if self.conn is None:
+            import sqlite3
+            self.conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.execute('PRAGMA temp_store=MEMORY')
+            self.conn.execute('PRAGMA cache_size=-16000')
+        return self.conn
+
+    def close(self):
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def get_stats(self):
+        with self.lock:
+            rows = self.connect().execute(
+                'SELECT module_id, COUNT(*), COALESCE(SUM(has_quiz), 0) FROM content GROUP BY module_id ORDER BY module_id'
+            ).fetchall()
+        return {
+            'total_lessons': sum(row[1] for row in rows),
+            'modules': {row[0]: {'lessons': row[1], 'with_quiz': row[2]} for row in rows}
+        }
+
+    def init_database(self):
+        try:
+            with self.lock:
+                conn = self.connect()
+                conn.execute('''
+                    CREATE TABLE IF NOT EXISTS content (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        module_id TEXT NOT NULL,
+                        lesson_id TEXT UNIQUE NOT NULL,
+                        title TEXT NOT NULL,
+                        description TEXT,
+                        video_path TEXT,
+                        pdf_path TEXT,
+                        has_quiz BOOLEAN DEFAULT 0,
+                        xp INTEGER DEFAULT 0,
+                        quiz_data TEXT,
+                        source_name TEXT,
+                        license_info TEXT,
+                        content_hash TEXT,
+                        scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                ''')
+                columns = {row[1] for row in conn.execute('PRAGMA table_info(content)')}
+                if 'content_hash' not in columns:
+                    conn.execute('ALTER TABLE content ADD COLUMN content_hash TEXT')
+                self.keyword_index.init_tables(conn)
+            logger.info("Database initialized for DjangApp")
+        except Exception as e:
+            logger.error(f"Error initializing database: {e}")
+
+    def categorize_for_djangapp(self, course):
+        with self.metrics.timer('categorize_module'):
+            return self._categorize_for_djangapp(course)
+
+    def _categorize_for_djangapp(self, course):
+        category_to_module = {
+            "computer_basics": "informatique",
+            "programming": "programmation",
+            "english_learning": None
+        }
+        for category in course.get('categories', []):
+            module_id = category_to_module.get(category)
+            if module_id:
+                return module_id
+        return self.categorize_for_djangapp_fallback(course.get('title', ''), course.get('description', ''))
+
+    def categorize_for_djangapp_fallback(self, title, description=""):
+        matches = self.module_matcher.match(f"{title} {description}")
+        return next(iter(matches), None)
+
+    def lesson_id_for(self, course, module_id):
+        return f"{module_id}-{course_fingerprint(course)[:16]}"
+
+    def content_hash_for(self, course, module_id):
+        pdf_url = next((m['url'] for m in course.get('materials', []) if m['type'] == 'pdf'), None)
+        payload = json.dumps([
+            module_id,
+            course.get('title', ''),
+            course.get('description', '')[:500],
+            pdf_url,
+            course.get('source', ''),
+            course.get('license', '')
+        ], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def build_content_row(self, course, module_id, lesson_id, content_hash, quiz_data=None):
+        if quiz_data is None:
+            quiz_data = self.generate_basic_quiz(course.get('title', ''), course.get('description', ''), module_id)
+        pdf_url = next((m['url'] for m in course.get('materials', []) if m['type'] == 'pdf'), None)
+        return (
+            module_id,
+            lesson_id,
+            course.get('title', ''),
+            course.get('description', '')[:500],
+            None,
+            pdf_url,
+            1 if quiz_data else 0,
+            15,
+            quiz_data,
+            course.get('source', ''),
+            course.get('license', ''),
+            content_hash
+        )
+
+    def _existing_hashes(self, conn, lesson_ids):
+        existing = {}
+        for start in range(0, len(lesson_ids), 900):
+            chunk = lesson_ids[start:start + 900]
+            placeholders = ','.join('?' * len(chunk))
+            existing.update(conn.execute(
+                f"SELECT lesson_id, content_hash FROM content WHERE lesson_id IN ({placeholders})", chunk
+            ))
+        return existing
+
+    def _upsert_rows(self, conn, pending):
+        pending = list({lesson_id: (course, module_id, lesson_id, content_hash)
+                        for course, module_id, lesson_id, content_hash in pending}.values())
+        with self.metrics.timer('db_lookup'):
+            existing = self._existing_hashes(conn, [item[2] for item in pending])
+        changed = [item for item in pending if existing.get(item[2]) != item[3]]
+        inserted = sum(1 for item in changed if item[2] not in existing)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # The keyword index is written in the same transaction so it never drifts from content.
+            with self.metrics.timer('keyword_index'):
+                if not self.keyword_index.synced:
+                    self.keyword_index.sync(conn)
+                quiz_terms = self.keyword_index.quiz_terms(conn, [
+                    (lesson_id, module_id, content_hash, course.get('title', ''), course.get('description', ''))
+                    for course, module_id, lesson_id, content_hash in changed
+                ])
+            with self.metrics.timer('quiz_batch'):
+                quizzes = self.quiz_engine.render_batch([
+                    (course.get('title', ''), course.get('description', ''), module_id,
+                     *quiz_terms.get(lesson_id, (None, ())))
+                    for course, module_id, lesson_id, _ in changed
+                ])
+            self.metrics.incr('quizzes_generated', len(quizzes))
+            rows = [self.build_content_row(*item, quiz_data) for item, quiz_data in zip(changed, quizzes)]
+            started = time.perf_counter()
+            conn.executemany('''
+                INSERT INTO content
+                (module_id, lesson_id, title, description, video_path, pdf_path,
+                 has_quiz, xp, quiz_data, source_name, license_info, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(lesson_id) DO UPDATE SET
+                    module_id = excluded.module_id,
+                    title = excluded.title,
+                    description = excluded.description,
+                    pdf_path = excluded.pdf_path,
+                    has_quiz = excluded.has_quiz,
+                    quiz_data = excluded.quiz_data,
+                    source_name = excluded.source_name,
+                    license_info = excluded.license_info,
+                    content_hash = excluded.content_hash,
+                    scraped_at = CURRENT_TIMESTAMP
+                WHERE content.content_hash IS NOT excluded.content_hash
+            ''', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            self.keyword_index.synced = False
+            raise
+        self.metrics.observe('db_write', time.perf_counter() - started)
+        self.metrics.incr('db_rows_written', len(changed))
+        self.metrics.incr('db_rows_unchanged', len(pending) - len(changed))
+        return inserted, len(changed) - inserted, len(pending) - len(changed)
+
+    def integrate_scraped_courses(self, courses_data, batch_size=None):
+        batch_size = batch_size or self.batch_size
+        integrated_count = 0
+        errors = []
+        self.last_ingest_report = []
+        courses = iter(courses_data)
+        try:
+            with self.lock:
+                conn = self.connect()
+                while True:
+                    batch = list(itertools.islice(courses, batch_size))
+                    if not batch:
+                        break
+                    started = time.monotonic()
+                    pending = []
+                    skipped = 0
+                    for course in batch:
+                        module_id = course.get('module_id') or self.categorize_for_djangapp(course)
+                        if not module_id:
+                            # No DjangApp module for this topic: counted as skipped, not an error.
+                            skipped += 1
+                            continue
+                        pending.append((
+                            course, module_id,
+                            self.lesson_id_for(course, module_id),
+                            self.content_hash_for(course, module_id)
+                        ))
+                    try:
+                        inserted, updated, unchanged = self._upsert_rows(conn, pending)
+                    except Exception as e:
+                        errors.append(f"Error inserting batch of {len(pending)} courses: {e}")
+                        logger.error(f"Error inserting batch of {len(pending)} courses: {e}")
+                        inserted, updated, unchanged = 0, 0, 0
+                        skipped += len(pending)
+                    report = {
+                        'inserted': inserted,
+                        'updated': updated,
+                        'skipped': skipped + unchanged,
+                        'seconds': round(time.monotonic() - started, 4)
+                    }
+                    self.last_ingest_report.append(report)
+                    for key in self.ingest_totals:
+                        self.ingest_totals[key] += report[key]
+                    integrated_count += inserted + updated
+                    logger.info(
+                        f"Batch committed: {inserted} inserted, {updated} updated, "
+                        f"{report['skipped']} skipped in {report['seconds']}s"
+                    )
+            logger.info(f"Integrated {integrated_count} courses into DjangApp")
+            return integrated_count, errors
+        except Exception as e:
+            logger.error(f"Integration error: {e}")
+            return integrated_count, errors + [f"Integration failed: {e}"]
+
+    def generate_basic_quiz(self, title, description, module_id):
+        return self.quiz_engine.render(title, description, module_id)
+
+def run_djangapp_integration(scraper, integrator, budget_seconds=None, refresh=False, sources=None, metrics_file=None):
+    started = time.monotonic()
+    scraper.deadline = scraper.hard_deadline = None
+    if budget_seconds:
+        scraper.set_budget(budget_seconds)
+    integrator.ingest_totals = {'inserted': 0, 'updated': 0, 'skipped': 0}
+    scraper.metrics = Metrics()
+    integrator.metrics = Metrics()
+    print("🎯 Scraping for DjangApp...", file=sys.stderr)
+    print("Modules: Bureautique, Informatique, Programmation\n", file=sys.stderr)
+    with scraper.open_course_stream() as stream:
+        pipeline = ScrapePipeline(scraper, integrator, stream)
+        summary = pipeline.run(sources=sources, refresh=refresh)
+    filepath = stream.path
+    budget = {
+        "seconds": budget_seconds,
+        "elapsed": round(time.monotonic() - started, 2),
+        "exhausted": scraper.out_of_time()
+    }
+    if summary.total:
+        scraper.print_topic_report(summary)
+        print(f"\n✅ Results for DjangApp:", file=sys.stderr)
+        print(f"📚 {summary.total} courses scraped", file=sys.stderr)
+        print(f"🎯 {pipeline.integrated} courses integrated into app", file=sys.stderr)
+        print(f"💾 Data saved: {filepath}", file=sys.stderr)
+        result = {
+            "success": len(pipeline.errors) == 0,
+            "total_scraped": summary.total,
+            "integrated": pipeline.integrated,
+            "modules_breakdown": summary.modules_breakdown,
+            "output_file": filepath,
+            "sources": scraper.source_results,
+            "rate_limits": scraper.rate_limiter.get_stats(),
+            "http_cache": scraper.http_cache.get_stats(),
+            "crawl_state": scraper.crawl_state.get_stats(),
+            "budget": budget,
+            "ingest": integrator.ingest_totals,
+            "metrics": collect_metrics(scraper, integrator),
+            "errors": pipeline.errors
+        }
+    else:
+        print("❌ No courses found", file=sys.stderr)
+        result = {
+            "success": False,
+            "total_scraped": 0,
+            "integrated": 0,
+            "modules_breakdown": {},
+            "output_file": None,
+            "sources": scraper.source_results,
+            "rate_limits": scraper.rate_limiter.get_stats(),
+            "http_cache": scraper.http_cache.get_stats(),
+            "crawl_state": scraper.crawl_state.get_stats(),
+            "budget": budget,
+            "metrics": collect_metrics(scraper, integrator),
+            "errors": ["No courses found"]
+        }
+    if metrics_file:
+        write_prometheus(metrics_file, result['metrics'])
+    scraper.events.emit('finished', result=result)
+    return result
+
+def main_with_djangapp_integration(budget_seconds=None, refresh=False, events=None, metrics_file=None):
+    scraper = TopicSpecificScraper(output_dir="educational_courses")
+    if events is not None:
+        scraper.events = events
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: scraper.stop())
+    integrator = DjangAppIntegrator()
+    return run_djangapp_integration(scraper, integrator, budget_seconds, refresh, metrics_file=metrics_file)
+
+class JsonRpcChannel:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.lock = threading.Lock()
+
+    def send(self, message):
+        line = json.dumps(dict(jsonrpc='2.0', **message), ensure_ascii=False)
+        with self.lock:
+            try:
+                self.writer.write(line + '\n')
+                self.writer.flush()
+            except (OSError, ValueError) as e:
+                logger.warning(f"JSON-RPC client went away: {e}")
+
+    def notify(self, method, params):
+        self.send({'method': method, 'params': params})
+
+    def reply(self, request_id, result=None, error=None):
+        if error is not None:
+            self.send({'id': request_id, 'error': error})
+        elif request_id is not None:
+            self.send({'id': request_id, 'result': result})
+
+    def __iter__(self):
+        for line in self.reader:
+            if line.strip():
+                yield line
+
+class JobEvents(ProgressEvents):
+    def __init__(self, channel, job_id):
+        super().__init__()
+        self.channel = channel
+        self.job_id = job_id
+
+    def emit(self, event, **fields):
+        self.channel.notify('progress', dict(job=self.job_id, event=event, ts=round(time.time(), 3), **fields))
+
+class JsonRpcRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        channel = JsonRpcChannel(
+            io.TextIOWrapper(self.rfile, encoding='utf-8'),
+            io.TextIOWrapper(self.wfile, encoding='utf-8', write_through=True)
+        )
+        self.server.service.serve_channel(channel)
+
+class ScraperService:
+    # Keeps one warm scraper (HTTP session, robots, rate limits, caches) and DB connection across jobs.
+    def __init__(self, output_dir="educational_courses", db_path="database/app.db", metrics_file=None):
+        self.scraper = TopicSpecificScraper(output_dir=output_dir)
+        self.integrator = DjangAppIntegrator(db_path)
+        self.metrics_file = metrics_file
+        self.job_lock = threading.Lock()
+        self.current_job = None
+        self.running = True
+        self.server = None
+        self.methods = {
+            'ping': self.ping,
+            'stats': self.stats,
+            'cancel': self.cancel,
+            'shutdown': self.shutdown
+        }
+        self.jobs = {
+            'scrape_all': self.scrape_all,
+            'scrape_source': self.scrape_source,
+            'scrape_url': self.scrape_url
+        }
+
+    def ping(self):
+        return {'pong': True, 'job': self.current_job}
+
+    def stats(self):
+        return {
+            'job': self.current_job,
+            'sources': self.scraper.source_results,
+            'rate_limits': self.scraper.rate_limiter.get_stats(),
+            'http_cache': self.scraper.http_cache.get_stats(),
+            'crawl_state': self.scraper.crawl_state.get_stats(),
+            'ingest': self.integrator.ingest_totals,
+            'metrics': collect_metrics(self.scraper, self.integrator)
+        }
+
+    def cancel(self):
+        cancelled = self.current_job
+        if cancelled is not None:
+            self.scraper.stop()
+        return {'cancelled': cancelled}
+
+    def shutdown(self):
+        self.running = False
+        self.cancel()
+        if self.server is not None:
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        return {'stopping': True}
+
+    def scrape_all(self, budget_seconds=None, refresh=False):
+        return run_djangapp_integration(self.scraper, self.integrator, budget_seconds, refresh,
+                                        metrics_file=self.metrics_file)
+
+    def scrape_source(self, source, budget_seconds=None, refresh=False):
+        config = configured_sources().get(source)
+        if config is None:
+            raise ValueError(f"Unknown source: {source}")
+        return run_djangapp_integration(self.scraper, self.integrator, budget_seconds, refresh, [(source, config)],
+                                        self.metrics_file)
+
+    def scrape_url(self, url, source=None):
+        if source is None:
+            source, config = self.scraper.source_for_url(url)
+        else:
+            config = configured_sources().get(source)
+        if config is None:
+            raise ValueError(f"No known source for {url}")
+        parse_page, scoped = self.scraper.page_parser_for(url, config)
+        if parse_page is None:
+            raise ValueError(f"No page parser configured for {source}")
+        self.scraper.deadline = self.scraper.hard_deadline = None
+        courses = self.scraper.crawl_page(url, config, parse_page, scoped, force=True)
+        integrated, errors = self.integrator.integrate_scraped_courses(courses)
+        self.scraper.events.emit('batch_committed', courses=len(courses), integrated=integrated,
+                                 total_integrated=integrated, errors=len(errors))
+        return {'url': url, 'source': source, 'courses': courses, 'integrated': integrated, 'errors': errors}
+
+    def handle(self, channel, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            channel.reply(None, error={'code': -32700, 'message': f"Parse error: {e}"})
+            return
+        if not isinstance(request, dict):
+            channel.reply(None, error={'code': -32600, 'message': "Invalid request"})
+            return
+        request_id = request.get('id')
+        method = request.get('method')
+        params = request.get('params') or {}
+        if not isinstance(method, str) or not isinstance(params, dict):
+            channel.reply(request_id, error={'code': -32600, 'message': "Invalid request"})
+            return
+        if method in self.jobs:
+            self.start_job(channel, request_id, method, params)
+            return
+        if method not in self.methods:
+            channel.reply(request_id, error={'code': -32601, 'message': f"Unknown method: {method}"})
+            return
+        try:
+            channel.reply(request_id, self.methods[method](**params))
+        except TypeError as e:
+            channel.reply(request_id, error={'code': -32602, 'message': str(e)})
+
+    def start_job(self, channel, request_id, method, params):
+        if not self.job_lock.acquire(blocking=False):
+            channel.reply(request_id, error={'code': -32000, 'message': f"Job {self.current_job} is still running"})
+            return
+        self.current_job = request_id
+        threading.Thread(
+            target=self._run_job, args=(channel, request_id, method, params), name=f"job-{request_id}", daemon=True
+        ).start()
+
+    def _run_job(self, channel, request_id, method, params):
+        self.scraper.events = JobEvents(channel, request_id)
+        try:
+            channel.reply(request_id, self.jobs[method](**params))
+        except (TypeError, ValueError) as e:
+            channel.reply(request_id, error={'code': -32602, 'message': str(e)})
+        except Exception as e:
+            logger.error(f"Job {request_id} ({method}) failed: {e}")
+            channel.reply(request_id, error={'code': -32001, 'message': str(e)})
+        finally:
+            self.scraper.events = ProgressEvents()
+            self.current_job = None
+            self.job_lock.release()
+
+    def serve_channel(self, channel):
+        for line in channel:
+            self.handle(channel, line)
+            if not self.running:
+                break
+
+    def wait_for_job(self):
+        with self.job_lock:
+            pass
+
+    def serve_forever(self, socket_path=None):
+        if socket_path is None:
+            self.serve_channel(JsonRpcChannel(sys.stdin, sys.stdout))
+            self.cancel()
+        else:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            self.server = socketserver.ThreadingUnixStreamServer(socket_path, JsonRpcRequestHandler)
+            self.server.daemon_threads = True
+            self.server.service = self
+            logger.info(f"Scraper service listening on {socket_path}")
+            try:
+                self.server.serve_forever()
+            finally:
+                self.server.server_close()
+                os.remove(socket_path)
+        self.wait_for_job()
+        self.integrator.close()
+
+def describe_sources():
+    return {
+        source_name: {
+            'name': config['name'],
+            'base_url': config['base_url'],
+            'allowed': config.get('allowed', False),
+            'discovery': config.get('discovery') or config.get('mode') or 'pages'
+        }
+        for source_name, config in configured_sources().items()
+    }
+
+def collect_stats(output_dir="educational_courses", db_path="database/app.db"):
+    integrator = DjangAppIntegrator(db_path)
+    try:
+        stats = {'content': integrator.get_stats()}
+    finally:
+        integrator.close()
+    crawl_state_path = os.path.join(output_dir, 'crawl_state.db')
+    if os.path.exists(crawl_state_path):
+        stats['crawl_state'] = CrawlStateStore(crawl_state_path).get_stats()
+    return stats
+
+def serve_djangapp_integration(socket_path=None, metrics_file=None):
+    service = ScraperService(metrics_file=metrics_file)
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda signum, frame: service.shutdown())
+    service.serve_forever(socket_path)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape open educational resources into DjangApp")
+    parser.add_argument('command', nargs='?', default='scrape', choices=['scrape', 'serve', 'stats', 'sources'],
+                        help="scrape (default), serve JSON-RPC jobs, or offline-only stats / sources")
+    parser.add_argument('--budget-seconds', type=float, default=None,
+                        help="Stop fetching near this wall-clock budget and commit what was parsed")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Only refetch pages the recrawl scheduler marks as due")
+    parser.add_argument('--events', action='store_true',
+                        help="Write NDJSON progress events to stdout instead of the final JSON summary")
+    parser.add_argument('--events-fd', type=int, default=None,
+                        help="Write NDJSON progress events to this file descriptor")
+    parser.add_argument('--socket', default=None, help="Unix socket path for serve")
+    parser.add_argument('--metrics-file', default=None,
+                        help="Also write run metrics in Prometheus text format to this file")
+    args = parser.parse_args()
+    if args.command == 'stats':
+        print(json.dumps(collect_stats(), ensure_ascii=False, indent=2))
+        sys.exit(0)
+    if args.command == 'sources':
+        print(json.dumps(describe_sources(), ensure_ascii=False, indent=2))
+        sys.exit(0)
+    configure_logging()
+    if args.command == 'serve':
+        serve_djangapp_integration(args.socket, args.metrics_file)
+        sys.exit(0)
+    events = None
+    if args.events_fd is not None:
+        events = ProgressEvents(os.fdopen(args.events_fd, 'w', encoding='utf-8'))
+    elif args.events:
+        events = ProgressEvents(sys.stdout)
+    result = main_with_djangapp_integration(budget_seconds=args.budget_seconds, refresh=args.refresh, events=events,
+                                            metrics_file=args.metrics_file)
+    if not args.events or args.events_fd is not None:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
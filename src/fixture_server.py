@@ -0,0 +1,93 @@
+import argparse
+import gzip
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+# Replays recorded responses so scrapers can run offline.
+# Point a source's base_url at FixtureServer(...).base_url to use it; routes with
+# rewrite_base_url get {{base_url}} replaced so absolute links (sitemaps) resolve here.
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = urlparse(self.path)
+        route = self.server.fixtures.match(parts.path, dict(parse_qsl(parts.query, keep_blank_values=True)))
+        self.server.fixtures.requests.append(self.path)
+        if route is None:
+            self.send_error(404, "No fixture recorded for this request")
+            return
+        with open(os.path.join(self.server.fixtures.fixture_dir, route['file']), 'rb') as f:
+            body = f.read()
+        if route.get('rewrite_base_url'):
+            body = body.replace(b'{{base_url}}', self.server.fixtures.base_url.encode('ascii'))
+        if route.get('gzip'):
+            body = gzip.compress(body)
+        self.send_response(route.get('status', 200))
+        self.send_header('Content-Type', route.get('content_type', 'text/html; charset=utf-8'))
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in route.get('headers', {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer:
+    def __init__(self, fixture_dir, host='127.0.0.1', port=0):
+        self.fixture_dir = fixture_dir
+        with open(os.path.join(fixture_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            self.routes = json.load(f)['routes']
+        self.requests = []
+        self.httpd = ThreadingHTTPServer((host, port), FixtureRequestHandler)
+        self.httpd.fixtures = self
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def match(self, path, query):
+        best, best_score = None, -1
+        for route in self.routes:
+            if route['path'] != path:
+                continue
+            expected = route.get('query', {})
+            if any(query.get(key) != str(value) for key, value in expected.items()):
+                continue
+            if len(expected) > best_score:
+                best, best_score = route, len(expected)
+        return best
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve recorded scraper fixtures over HTTP")
+    parser.add_argument('fixture_dir')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    server = FixtureServer(args.fixture_dir, port=args.port)
+    print(f"Serving {args.fixture_dir} on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
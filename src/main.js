@@ -1,12 +1,20 @@
 const { app, BrowserWindow, ipcMain } = require('electron');
 const path = require('path');
 const Database = require('better-sqlite3');
-const { exec } = require('child_process');
-const util = require('util');
-const execPromise = util.promisify(exec);
+const { spawn } = require('child_process');
+const readline = require('readline');
 
 let mainWindow;
 let db;
+let scraperService = null;
+let scraperRequestId = 0;
+const scraperRequests = new Map();
+
+// The scraper stops fetching before this budget and commits what it has parsed,
+// so the hard timeout below is only a safety net.
+const SCRAPER_BUDGET_SECONDS = 270;
+const SCRAPER_TIMEOUT_MS = 300000;
+const SCRAPER_CANCEL_GRACE_MS = 30000;
 
 function createWindow() {
   mainWindow = new BrowserWindow({
@@ -47,25 +55,92 @@ function initializeDatabase() {
   }
 }
 
-async function runContentScraper() {
-  try {
-    console.log('Launching content scraper...');
-    const scraperPath = path.join(__dirname, 'enhanced_scraper.py');
-    const { stdout, stderr } = await execPromise(`python3 "${scraperPath}"`, {
-      cwd: __dirname,
-      timeout: 300000,
-    });
-
-    console.log('Scraper output:', stdout);
-    if (stderr) console.error('Scraper errors:', stderr);
+// One resident scraper process serves every job over JSON-RPC on stdin/stdout,
+// keeping its HTTP session, robots and caches warm between refreshes.
+function startScraperService() {
+  if (scraperService) return scraperService;
+  const scraperPath = path.join(__dirname, 'enhanced_scraper.py');
+  const child = spawn('python3', [scraperPath, 'serve'], { cwd: __dirname });
 
-    let results;
+  readline.createInterface({ input: child.stdout }).on('line', (line) => {
+    let message;
     try {
-      results = JSON.parse(stdout);
+      message = JSON.parse(line);
     } catch (parseError) {
-      console.error('Invalid JSON output:', parseError);
-      results = { success: false, error: 'Invalid scraper output' };
+      console.error('Invalid scraper message:', line);
+      return;
+    }
+    const pending = scraperRequests.get(message.method === 'progress' ? message.params.job : message.id);
+    if (!pending) return;
+    if (message.method === 'progress') {
+      pending.onEvent(message.params);
+      return;
     }
+    scraperRequests.delete(message.id);
+    if (message.error) pending.reject(new Error(message.error.message));
+    else pending.resolve(message.result);
+  });
+  child.stderr.on('data', (data) => console.error(data.toString()));
+
+  const onExit = (reason) => {
+    if (scraperService !== child) return;
+    scraperService = null;
+    for (const pending of scraperRequests.values()) pending.reject(new Error(reason));
+    scraperRequests.clear();
+  };
+  child.on('error', (error) => onExit(`Scraper service failed: ${error.message}`));
+  child.on('exit', (code, signal) => onExit(`Scraper service exited (code ${code}, signal ${signal})`));
+
+  scraperService = child;
+  return child;
+}
+
+function sendToScraper(child, message) {
+  child.stdin.write(JSON.stringify({ jsonrpc: '2.0', ...message }) + '\n');
+}
+
+function callScraper(method, params = {}, onEvent = () => {}) {
+  const child = startScraperService();
+  const id = ++scraperRequestId;
+  return new Promise((resolve, reject) => {
+    let killTimer;
+    // Past the deadline, ask the job to stop; it still commits and replies. Kill it only if it does not.
+    const cancelTimer = setTimeout(() => {
+      sendToScraper(child, { id: `cancel-${id}`, method: 'cancel' });
+      killTimer = setTimeout(() => child.kill('SIGKILL'), SCRAPER_CANCEL_GRACE_MS);
+    }, SCRAPER_TIMEOUT_MS);
+    const settle = (callback) => (value) => {
+      clearTimeout(cancelTimer);
+      clearTimeout(killTimer);
+      callback(value);
+    };
+    scraperRequests.set(id, { onEvent, resolve: settle(resolve), reject: settle(reject) });
+    sendToScraper(child, { id, method, params });
+  });
+}
+
+function stopScraperService() {
+  if (!scraperService) return;
+  sendToScraper(scraperService, { id: 'shutdown', method: 'shutdown' });
+  scraperService.stdin.end();
+}
+
+async function forwardScraperEvent(event) {
+  if (!mainWindow) return;
+  mainWindow.webContents.send('scraping-progress', event);
+  if (event.event === 'batch_committed' && event.integrated > 0) {
+    mainWindow.webContents.send('content-updated', await refreshContentFromDatabase());
+  }
+}
+
+async function runContentScraper() {
+  try {
+    console.log('Launching content scraper...');
+    const results = await callScraper(
+      'scrape_all',
+      { budget_seconds: SCRAPER_BUDGET_SECONDS },
+      forwardScraperEvent
+    );
 
     if (results.success && mainWindow) {
       const content = await refreshContentFromDatabase();
@@ -139,6 +214,10 @@ app.whenReady().then(() => {
   });
 });
 
+app.on('will-quit', () => {
+  stopScraperService();
+});
+
 app.on('window-all-closed', () => {
   if (process.platform !== 'darwin') app.quit();
 });
@@ -235,6 +314,22 @@ ipcMain.handle('getAssetPath', async (event, assetPath) => {
 
 ipcMain.handle('runContentScraper', runContentScraper);
 
+ipcMain.handle('scrapeSource', async (event, source) => {
+  try {
+    return await callScraper('scrape_source', { source, budget_seconds: SCRAPER_BUDGET_SECONDS }, forwardScraperEvent);
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+});
+
+ipcMain.handle('scrapeUrl', async (event, url) => {
+  try {
+    return await callScraper('scrape_url', { url }, forwardScraperEvent);
+  } catch (error) {
+    return { success: false, error: error.message };
+  }
+});
+
 ipcMain.handle('startQuiz', async (event, quizData) => {
   return await startQuiz(quizData);
 });
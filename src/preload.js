@@ -17,6 +17,8 @@ contextBridge.exposeInMainWorld('electronAPI', {
   getResources: (lessonId) => ipcRenderer.invoke('getResources', lessonId),
   getAssetPath: (path) => ipcRenderer.invoke('getAssetPath', path),
   runContentScraper: () => ipcRenderer.invoke('runContentScraper'),
+  scrapeSource: (source) => ipcRenderer.invoke('scrapeSource', source),
+  scrapeUrl: (url) => ipcRenderer.invoke('scrapeUrl', url),
   getScrapingStats: () => ipcRenderer.invoke('getScrapingStats'),
   manualContentRefresh: () => ipcRenderer.invoke('manualContentRefresh'),
   startQuiz: (quizData) => ipcRenderer.invoke('startQuiz', quizData),
@@ -29,6 +31,9 @@ contextBridge.exposeInMainWorld('electronAPI', {
   onScrapingStarted: (callback) => {
     ipcRenderer.on('scraping-started', (event, data) => callback(data));
   },
+  onScrapingProgress: (callback) => {
+    ipcRenderer.on('scraping-progress', (event, progress) => callback(progress));
+  },
   onScrapingCompleted: (callback) => {
     ipcRenderer.on('scraping-completed', (event, results) => callback(results));
   },
@@ -37,6 +42,7 @@ contextBridge.exposeInMainWorld('electronAPI', {
   },
   removeScrapingListeners: () => {
     ipcRenderer.removeAllListeners('scraping-started');
+    ipcRenderer.removeAllListeners('scraping-progress');
     ipcRenderer.removeAllListeners('scraping-completed');
   },
   removeQuizListeners: () => {
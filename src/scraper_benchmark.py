@@ -0,0 +1,362 @@
+import argparse
+import importlib.util
+import json
+import logging
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# Performance guards for the scraper. Run from src/:
+#   python scraper_benchmark.py import-time
+#   python scraper_benchmark.py run --courses 10000 100000 --save-baseline benchmarks/baseline.json
+#   python scraper_benchmark.py run --courses 10000 100000 --baseline benchmarks/baseline.json
+# Every stage runs in its own interpreter so peak RSS is reported per stage. Baselines are
+# machine-specific: record one on the machine that will run the comparison.
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(SRC_DIR, 'fixtures')
+SYNTHETIC_STAGES = ('categorize', 'integrate', 'save_json')
+HEAVY_MODULES = ('requests', 'bs4', 'backoff', 'lxml', 'sqlite3', 'urllib.robotparser', 'chardet')
+
+IMPORT_PROBE = '''
+import importlib.util, json, sys, time
+started = time.perf_counter()
+spec = importlib.util.spec_from_file_location("scraper_under_test", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [name for name in sys.argv[2:] if name in sys.modules]}))
+'''
+
+def default_scraper_path():
+    return os.path.join(SRC_DIR, 'enhanced_scraper.py')
+
+def measure_import(path, runs=10):
+    # Each run is a fresh interpreter so nothing is already in sys.modules; the first run also warms the .pyc.
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    subprocess.run([sys.executable, '-c', IMPORT_PROBE, path], check=True, capture_output=True, cwd=SRC_DIR, env=env)
+    samples = []
+    loaded = set()
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, '-c', IMPORT_PROBE, path, *HEAVY_MODULES],
+            check=True, capture_output=True, text=True, cwd=SRC_DIR, env=env
+        )
+        probe = json.loads(completed.stdout)
+        samples.append(probe['seconds'] * 1000)
+        loaded.update(probe['loaded'])
+    return {
+        'module': os.path.basename(path),
+        'runs': runs,
+        'median_ms': round(statistics.median(samples), 2),
+        'min_ms': round(min(samples), 2),
+        'max_ms': round(max(samples), 2),
+        'heavy_modules_loaded': sorted(loaded)
+    }
+
+def run_import_time(args):
+    result = measure_import(args.path, args.runs)
+    failures = []
+    if result['heavy_modules_loaded']:
+        failures.append(f"import loaded {', '.join(result['heavy_modules_loaded'])}")
+    if args.max_ms is not None and result['median_ms'] > args.max_ms:
+        failures.append(f"median import {result['median_ms']} ms exceeds {args.max_ms} ms")
+    result['failures'] = failures
+    print(json.dumps(result, indent=2))
+    return 1 if failures else 0
+
+def load_scraper(path):
+    if SRC_DIR not in sys.path:
+        sys.path.insert(0, SRC_DIR)
+    spec = importlib.util.spec_from_file_location('enhanced_scraper', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def per_second(count, seconds):
+    return round(count / seconds, 1) if seconds > 0 else None
+
+def replay_fixtures():
+    fixtures = {}
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        manifest_path = os.path.join(FIXTURES_DIR, name, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            continue
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('source'):
+            fixtures[name] = manifest
+    return fixtures
+
+SYNTHETIC_TOPICS = {
+    'computer_basics': (
+        ["Informatique", "Bureautique", "Windows", "Internet", "Ordinateur", "Computer", "Office"],
+        ["pour débutant", "les bases", "basics for beginners", "au quotidien", "pas à pas"]
+    ),
+    'programming': (
+        ["Python", "Programmation", "HTML et CSS", "Algorithmique", "JavaScript", "Programming", "Coding"],
+        ["introduction", "pour débutant", "les fondamentaux", "from scratch", "avancé"]
+    ),
+    'english_learning': (
+        ["Anglais", "English grammar", "Vocabulary", "Business English"],
+        ["débutant", "intermediate", "au travail", "for travellers"]
+    ),
+    'other': (
+        ["Histoire de l'art", "Philosophie", "Cuisine", "Botanique", "Astronomy", "Music theory"],
+        ["introduction", "panorama", "for everyone", "du Moyen Âge à nos jours"]
+    )
+}
+SYNTHETIC_FILLER = (
+    "Ce cours présente les notions essentielles avec des exercices corrigés et des études de cas. "
+    "Each unit combines short videos, readings and a graded assignment. "
+    "Les participants progressent à leur rythme et obtiennent une attestation de suivi. "
+).split()
+SYNTHETIC_SOURCES = ['FUN MOOC', 'MIT OpenCourseWare', 'OpenClassrooms', 'France-IOI', 'Wikiversity']
+
+def synthetic_catalog(count, seed=42, revision=0, revised_every=10):
+    # Deterministic catalog shaped like scraper output. revision > 0 rewrites one course in
+    # revised_every so re-integration exercises the update path.
+    rng = random.Random(seed)
+    topics = list(SYNTHETIC_TOPICS)
+    for index in range(count):
+        topic = rng.choice(topics)
+        subjects, suffixes = SYNTHETIC_TOPICS[topic]
+        title = f"{rng.choice(subjects)} {rng.choice(suffixes)} #{index}"
+        words = rng.choices(SYNTHETIC_FILLER, k=rng.randint(20, 80))
+        if revision and index % revised_every == 0:
+            words.append(f"(révision {revision})")
+        source = rng.choice(SYNTHETIC_SOURCES)
+        course = {
+            'title': title,
+            'description': ' '.join(words),
+            'url': f"https://example.org/{source.split()[0].lower()}/courses/{index}",
+            'source': source,
+            'license': 'CC BY-NC-SA',
+            'scraped_at': '2024-01-01T00:00:00',
+            'categories': [topic]
+        }
+        if index % 3 == 0:
+            course['materials'] = [{'type': 'pdf', 'url': f"https://example.org/files/{index}.pdf"}]
+        yield course
+
+def bench_replay(module, fixture_name, repeat):
+    from fixture_server import FixtureServer
+    from urllib.parse import urlparse
+    fixture_dir = os.path.join(FIXTURES_DIR, fixture_name)
+    manifest = replay_fixtures()[fixture_name]
+    samples = []
+    for _ in range(repeat):
+        output_dir = tempfile.mkdtemp(prefix='bench-replay-')
+        try:
+            with FixtureServer(fixture_dir) as server:
+                # A fresh output dir per run keeps the HTTP cache and crawl state cold.
+                scraper = module.TopicSpecificScraper(output_dir=output_dir)
+                scraper.rate_limiter.configure(urlparse(server.base_url).netloc, calls=100000, period=1, burst=100000)
+                config = dict(module.configured_sources()[manifest['source']], base_url=server.base_url, **manifest['config'])
+                started = time.perf_counter()
+                courses = list(scraper.iter_source(manifest['source'], config))
+                elapsed = time.perf_counter() - started
+                pages = sum(1 for path in server.requests if not path.startswith('/robots.txt'))
+                error = scraper.source_results.get(manifest['source'], {}).get('error')
+                scraper.crawl_state.conn.close()
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        if error:
+            raise RuntimeError(f"{fixture_name}: {error}")
+        samples.append((elapsed, pages, len(courses)))
+    elapsed, pages, courses = sorted(samples)[len(samples) // 2]
+    return {
+        'source': manifest['source'],
+        'runs': repeat,
+        'pages': pages,
+        'courses': courses,
+        'seconds': round(elapsed, 4),
+        'pages_per_s': per_second(pages, elapsed),
+        'courses_per_s': per_second(courses, elapsed)
+    }
+
+def bench_categorize(module, count):
+    output_dir = tempfile.mkdtemp(prefix='bench-categorize-')
+    try:
+        scraper = module.TopicSpecificScraper(output_dir=output_dir)
+        courses = synthetic_catalog(count)
+        started = time.perf_counter()
+        matched = 0
+        for course in courses:
+            if scraper.categorize_course(course['title'], course['description']) != ['other']:
+                matched += 1
+        elapsed = time.perf_counter() - started
+        scraper.crawl_state.conn.close()
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return {
+        'courses': count,
+        'matched': matched,
+        'seconds': round(elapsed, 4),
+        'courses_per_s': per_second(count, elapsed)
+    }
+
+def bench_integrate(module, count):
+    output_dir = tempfile.mkdtemp(prefix='bench-integrate-')
+    try:
+        integrator = module.DjangAppIntegrator(db_path=os.path.join(output_dir, 'app.db'))
+        result = {'courses': count}
+        # Cold insert, an unchanged re-run (hash short-circuit) and a 10% content update.
+        for phase, revision in (('insert', 0), ('unchanged', 0), ('update', 1)):
+            started = time.perf_counter()
+            integrated, errors = integrator.integrate_scraped_courses(synthetic_catalog(count, revision=revision))
+            elapsed = time.perf_counter() - started
+            result[f"{phase}_written"] = integrated
+            result[f"{phase}_seconds"] = round(elapsed, 4)
+            result[f"{phase}_rows_per_s"] = per_second(count, elapsed)
+        result['rows'] = integrator.get_stats()['total_lessons']
+        integrator.close()
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return result
+
+def bench_save_json(module, count):
+    output_dir = tempfile.mkdtemp(prefix='bench-save-')
+    try:
+        scraper = module.TopicSpecificScraper(output_dir=output_dir)
+        courses = list(synthetic_catalog(count))
+        started = time.perf_counter()
+        path = scraper.save_courses_to_json(courses)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+        scraper.crawl_state.conn.close()
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+    return {
+        'courses': count,
+        'bytes': size,
+        'seconds': round(elapsed, 4),
+        'courses_per_s': per_second(count, elapsed)
+    }
+
+def run_stage(args):
+    logging.basicConfig(level=logging.WARNING)
+    module = load_scraper(args.path)
+    if args.stage == 'replay':
+        result = bench_replay(module, args.fixture, args.repeat)
+    elif args.stage == 'categorize':
+        result = bench_categorize(module, args.courses)
+    elif args.stage == 'integrate':
+        result = bench_integrate(module, args.courses)
+    else:
+        result = bench_save_json(module, args.courses)
+    result['peak_rss_mb'] = peak_rss_mb()
+    print(json.dumps(result))
+    return 0
+
+def spawn_stage(path, stage, *options):
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), 'stage', stage, '--path', path, *map(str, options)],
+        capture_output=True, text=True, cwd=SRC_DIR, env=env
+    )
+    if completed.returncode != 0:
+        return {'error': completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit {completed.returncode}"}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare_to_baseline(stages, baseline, tolerance):
+    regressions = []
+    for name, metrics in baseline.get('stages', {}).items():
+        current = stages.get(name)
+        if current is None:
+            continue
+        if 'error' in current:
+            regressions.append(f"{name}: {current['error']}")
+            continue
+        for key, expected in metrics.items():
+            value = current.get(key)
+            if not isinstance(expected, (int, float)) or not isinstance(value, (int, float)):
+                continue
+            if key.endswith('_per_s') and value < expected * (1 - tolerance):
+                regressions.append(f"{name}.{key}: {value} < baseline {expected}")
+            elif key == 'peak_rss_mb' and value > expected * (1 + tolerance):
+                regressions.append(f"{name}.{key}: {value} > baseline {expected}")
+    return regressions
+
+def run_benchmarks(args):
+    stages = {}
+    if not args.skip_replay:
+        for fixture in replay_fixtures():
+            print(f"replay:{fixture}", file=sys.stderr)
+            stages[f"replay:{fixture}"] = spawn_stage(args.path, 'replay', '--fixture', fixture, '--repeat', args.repeat)
+    for count in args.courses:
+        for stage in SYNTHETIC_STAGES:
+            if stage in args.skip:
+                continue
+            print(f"{stage}:{count}", file=sys.stderr)
+            stages[f"{stage}:{count}"] = spawn_stage(args.path, stage, '--courses', count)
+    report = {
+        'recorded_at': datetime.now().isoformat(),
+        'python': sys.version.split()[0],
+        'platform': sys.platform,
+        'stages': stages
+    }
+    failures = [f"{name}: {result['error']}" for name, result in stages.items() if 'error' in result]
+    # A replay that parses nothing means a parser or fixture broke, not that the stage got faster.
+    failures += [f"{name}: no courses parsed" for name, result in stages.items()
+                 if name.startswith('replay:') and result.get('courses') == 0]
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            failures += compare_to_baseline(stages, json.load(f), args.tolerance)
+    report['failures'] = failures
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save_baseline)), exist_ok=True)
+        with open(args.save_baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+    return 1 if failures else 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper performance benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+    import_time = commands.add_parser('import-time', help="Cold import latency of the scraper module")
+    import_time.add_argument('--path', default=default_scraper_path())
+    import_time.add_argument('--runs', type=int, default=10)
+    import_time.add_argument('--max-ms', type=float, default=100.0,
+                             help="Fail when the median cold import is slower than this")
+    import_time.set_defaults(handler=run_import_time)
+    run = commands.add_parser('run', help="Replay fixtures and synthetic catalogs through every stage")
+    run.add_argument('--path', default=default_scraper_path())
+    run.add_argument('--courses', type=int, nargs='+', default=[10000],
+                     help="Synthetic catalog sizes, e.g. 10000 100000 1000000")
+    run.add_argument('--repeat', type=int, default=3, help="Fixture replays per source; the median is reported")
+    run.add_argument('--skip', nargs='*', default=[], choices=SYNTHETIC_STAGES)
+    run.add_argument('--skip-replay', action='store_true')
+    run.add_argument('--baseline', help="Fail when a stage is slower or larger than this recorded run")
+    run.add_argument('--tolerance', type=float, default=0.25)
+    run.add_argument('--save-baseline', help="Write this run's report as the new baseline")
+    run.set_defaults(handler=run_benchmarks)
+    stage = commands.add_parser('stage', help="Run a single stage in this process (used by run)")
+    stage.add_argument('stage', choices=('replay',) + SYNTHETIC_STAGES)
+    stage.add_argument('--path', default=default_scraper_path())
+    stage.add_argument('--fixture')
+    stage.add_argument('--repeat', type=int, default=3)
+    stage.add_argument('--courses', type=int, default=10000)
+    stage.set_defaults(handler=run_stage)
+    args = parser.parse_args()
+    sys.exit(args.handler(args))
+
+if __name__ == "__main__":
+    main()